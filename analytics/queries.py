@@ -1,65 +1,181 @@
 from database.operations import DatabaseOperations
 import pandas as pd
+import numpy as np
 from typing import Dict, Any, Optional, List
 import sqlite3
+import threading
+from collections import OrderedDict
+from functools import wraps
+
+def _has_content(result: Any) -> bool:
+    """Whether a query result is worth caching"""
+    if isinstance(result, dict):
+        return any(_has_content(value) for value in result.values())
+    if isinstance(result, (pd.DataFrame, pd.Series, list, tuple)):
+        return len(result) > 0
+    return result is not None
+
+def cached_result(method):
+    """Memoize a read-only analytics method on its arguments until the data changes"""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._cache_lock:
+            self._check_data_version()
+            key = (method.__name__, args, tuple(sorted(kwargs.items())))
+            if key in self._result_cache:
+                self._result_cache.move_to_end(key)
+                return self._result_cache[key]
+            
+            result = method(self, *args, **kwargs)
+            # Empty results usually mean a failed query, so they are not worth keeping;
+            # a dict of sections (e.g. a state report) counts as empty when every section is
+            if _has_content(result):
+                self._result_cache[key] = result
+                if len(self._result_cache) > self.RESULT_CACHE_SIZE:
+                    self._result_cache.popitem(last=False)
+            return result
+    return wrapper
 
 class PhonePeAnalytics:
-    def __init__(self, db_path: str = "phonepe_insights.db"):
-        self.db_ops = DatabaseOperations(db_path)
+    # Number of (method, arguments) results kept; cached frames are shared, so copy before mutating
+    RESULT_CACHE_SIZE = 64
+    
+    # Days per quarter used to turn quarterly totals into daily rates
+    DAYS_IN_QUARTER = {1: 90, 2: 91, 3: 92, 4: 92}
+    
+    # Fixed SQL per metric so repeat calls hit the same cached statement
+    TOP_PINCODE_QUERIES = {
+        'transaction_amount': """
+            SELECT 
+                state,
+                pincode,
+                SUM(transaction_count) as total_transactions,
+                SUM(transaction_amount) as total_amount,
+                AVG(transaction_amount) as avg_amount,
+                COUNT(DISTINCT year) as years_active,
+                (MAX(quarter = 1) + MAX(quarter = 2) + MAX(quarter = 3) + MAX(quarter = 4)) as quarters_active
+            FROM top_transaction
+            GROUP BY state, pincode
+            ORDER BY total_amount DESC
+            LIMIT ?
+        """,
+        'registered_users': """
+            SELECT 
+                state,
+                pincode,
+                SUM(registered_users) as total_users,
+                COUNT(DISTINCT year) as years_active,
+                (MAX(quarter = 1) + MAX(quarter = 2) + MAX(quarter = 3) + MAX(quarter = 4)) as quarters_active
+            FROM top_user
+            GROUP BY state, pincode
+            ORDER BY total_users DESC
+            LIMIT ?
+        """
+    }
+    
+    def __init__(self, db_path: str = "phonepe_insights.db", connection: Optional[sqlite3.Connection] = None):
+        self.db_ops = DatabaseOperations(db_path, connection)
+        # Read-only: schema upgrades happen in setup or DatabaseManager.migrate()
         self.db_ops.connect()
+        self._result_cache: "OrderedDict[tuple, Any]" = OrderedDict()
+        # One instance may be shared by several dashboard sessions, each on its own thread
+        self._cache_lock = threading.RLock()
+        self._data_version = self.db_ops.get_data_version()
+    
+    def refresh(self):
+        """Forget cached results so the next call sees newly loaded data"""
+        self.invalidate()
+    
+    def invalidate(self):
+        """Drop all cached query results"""
+        self._result_cache.clear()
     
+    def _check_data_version(self):
+        """Refresh caches if any connection, including a shared one, has written since the last call"""
+        data_version = self.db_ops.get_data_version()
+        if data_version != self._data_version:
+            self._data_version = data_version
+            self.refresh()
+    
+    @staticmethod
+    def _share_of_total(column: str) -> str:
+        """SQL expression for a roll-up column as a percentage of its sum over the same roll-up table"""
+        # The window sum is taken before LIMIT, and numerator and denominator always come from one snapshot
+        return f"ROUND({column} * 100.0 / NULLIF(SUM({column}) OVER (), 0), 2)"
+    
+    @cached_result
     def get_transaction_overview(self) -> Dict[str, Any]:
         """Get overall transaction statistics"""
         query = """
         SELECT 
-            COUNT(*) as total_transactions,
-            SUM(transaction_count) as total_transaction_count,
-            SUM(transaction_amount) as total_transaction_amount,
-            AVG(transaction_amount) as avg_transaction_amount,
-            COUNT(DISTINCT state) as unique_states,
-            COUNT(DISTINCT transaction_type) as unique_transaction_types,
-            MIN(year) as earliest_year,
-            MAX(year) as latest_year
-        FROM aggregated_transaction
+            total_transactions,
+            total_transaction_count,
+            total_transaction_amount,
+            avg_transaction_amount,
+            unique_states,
+            unique_transaction_types,
+            earliest_year,
+            latest_year
+        FROM mv_overview
         """
         result = self.db_ops.execute_query(query)
         return result.to_dict('records')[0] if not result.empty else {}
     
+    @cached_result
     def get_state_wise_analysis(self, limit: int = 10) -> pd.DataFrame:
         """Get top states by transaction volume and amount"""
-        query = """
+        query = f"""
         SELECT 
             state,
-            SUM(transaction_count) as total_transactions,
-            SUM(transaction_amount) as total_amount,
-            AVG(transaction_amount) as avg_amount,
-            COUNT(DISTINCT year) as years_active,
-            COUNT(DISTINCT transaction_type) as transaction_types,
-            ROUND(
-                (SUM(transaction_amount) * 100.0 / 
-                (SELECT SUM(transaction_amount) FROM aggregated_transaction)), 2
-            ) as percentage_of_total
-        FROM aggregated_transaction
-        GROUP BY state
+            total_transactions,
+            total_amount,
+            avg_amount,
+            years_active,
+            transaction_types,
+            {self._share_of_total('total_amount')} as percentage_of_total
+        FROM mv_state_totals
         ORDER BY total_amount DESC
         LIMIT ?
         """
         return self.db_ops.execute_query(query, (limit,))
     
+    @cached_result
+    def get_state_names(self) -> List[str]:
+        """Get the names of all states with transactions, alphabetically"""
+        result = self.db_ops.execute_query("SELECT state FROM mv_state_totals ORDER BY state")
+        return result['state'].astype(str).tolist() if not result.empty else []
+    
+    def get_dashboard_bundle(self, state_limit: int = 10) -> Dict[str, Any]:
+        """Get the overview, state, transaction type and quarterly results in one call"""
+        # Every piece is read from the roll-up tables, so the fact table is not scanned at all
+        return {
+            'overview': self.get_transaction_overview(),
+            'states': self.get_state_wise_analysis(state_limit),
+            'transaction_types': self.get_transaction_type_analysis(),
+            'quarterly_trends': self.get_quarterly_trends()
+        }
+    
+    def get_user_analytics_bundle(self, brand_limit: int = 10) -> Dict[str, pd.DataFrame]:
+        """Get the brand and user engagement results in one call"""
+        return {
+            'brands': self.get_brand_analysis(brand_limit),
+            'engagement': self.get_user_engagement_metrics()
+        }
+    
+    @cached_result
     def get_quarterly_trends(self, year: Optional[int] = None) -> pd.DataFrame:
         """Get quarterly transaction trends"""
         if year:
             query = """
             SELECT 
                 quarter,
-                SUM(transaction_count) as total_transactions,
-                SUM(transaction_amount) as total_amount,
-                AVG(transaction_amount) as avg_amount,
-                COUNT(DISTINCT state) as states_active,
-                COUNT(DISTINCT transaction_type) as types_active
-            FROM aggregated_transaction
+                total_transactions,
+                total_amount,
+                avg_amount,
+                states_active,
+                types_active
+            FROM mv_year_quarter_totals
             WHERE year = ?
-            GROUP BY quarter
             ORDER BY quarter
             """
             return self.db_ops.execute_query(query, (year,))
@@ -68,90 +184,75 @@ class PhonePeAnalytics:
             SELECT 
                 year,
                 quarter,
-                SUM(transaction_count) as total_transactions,
-                SUM(transaction_amount) as total_amount,
-                AVG(transaction_amount) as avg_amount,
-                COUNT(DISTINCT state) as states_active
-            FROM aggregated_transaction
-            GROUP BY year, quarter
+                total_transactions,
+                total_amount,
+                avg_amount,
+                states_active
+            FROM mv_year_quarter_totals
             ORDER BY year, quarter
             """
             return self.db_ops.execute_query(query)
     
+    @cached_result
     def get_transaction_type_analysis(self) -> pd.DataFrame:
         """Analyze transaction types comprehensively"""
-        query = """
+        query = f"""
         SELECT 
             transaction_type,
-            SUM(transaction_count) as total_transactions,
-            SUM(transaction_amount) as total_amount,
-            AVG(transaction_amount) as avg_amount,
-            MIN(transaction_amount) as min_amount,
-            MAX(transaction_amount) as max_amount,
-            COUNT(DISTINCT state) as states_covered,
-            COUNT(DISTINCT year) as years_active,
-            ROUND(
-                (SUM(transaction_amount) * 100.0 / 
-                (SELECT SUM(transaction_amount) FROM aggregated_transaction)), 2
-            ) as percentage_of_total,
-            ROUND(
-                (SUM(transaction_count) * 100.0 / 
-                (SELECT SUM(transaction_count) FROM aggregated_transaction)), 2
-            ) as volume_percentage
-        FROM aggregated_transaction
-        GROUP BY transaction_type
+            total_transactions,
+            total_amount,
+            avg_amount,
+            min_amount,
+            max_amount,
+            states_covered,
+            years_active,
+            {self._share_of_total('total_amount')} as percentage_of_total,
+            {self._share_of_total('total_transactions')} as volume_percentage
+        FROM mv_type_totals
         ORDER BY total_amount DESC
         """
         return self.db_ops.execute_query(query)
     
+    @cached_result
     def get_brand_analysis(self, limit: int = 15) -> pd.DataFrame:
         """Analyze user preferences by device brands"""
-        query = """
+        query = f"""
         SELECT 
             brands,
-            SUM(count) as total_users,
-            AVG(percentage) as avg_market_share,
-            MIN(percentage) as min_market_share,
-            MAX(percentage) as max_market_share,
-            COUNT(DISTINCT state) as states_present,
-            COUNT(DISTINCT year) as years_active,
-            ROUND(
-                (SUM(count) * 100.0 / 
-                (SELECT SUM(count) FROM aggregated_user)), 2
-            ) as overall_market_share
-        FROM aggregated_user
-        GROUP BY brands
+            total_users,
+            avg_market_share,
+            min_market_share,
+            max_market_share,
+            states_present,
+            years_active,
+            {self._share_of_total('total_users')} as overall_market_share
+        FROM mv_brand_totals
         ORDER BY total_users DESC
         LIMIT ?
         """
         return self.db_ops.execute_query(query, (limit,))
     
+    @cached_result
     def get_insurance_insights(self) -> pd.DataFrame:
         """Get comprehensive insurance adoption insights"""
-        query = """
+        query = f"""
         SELECT 
             insurance_type,
-            SUM(insurance_count) as total_policies,
-            SUM(insurance_amount) as total_premium,
-            AVG(insurance_amount) as avg_premium,
-            MIN(insurance_amount) as min_premium,
-            MAX(insurance_amount) as max_premium,
-            COUNT(DISTINCT state) as states_covered,
-            COUNT(DISTINCT year) as years_active,
-            ROUND(
-                (SUM(insurance_amount) * 100.0 / 
-                (SELECT SUM(insurance_amount) FROM aggregated_insurance)), 2
-            ) as premium_percentage,
-            ROUND(
-                (SUM(insurance_count) * 100.0 / 
-                (SELECT SUM(insurance_count) FROM aggregated_insurance)), 2
-            ) as policy_percentage
-        FROM aggregated_insurance
-        GROUP BY insurance_type
+            total_policies,
+            total_premium,
+            avg_premium,
+            min_premium,
+            max_premium,
+            states_covered,
+            years_active,
+            {self._share_of_total('total_premium')} as premium_percentage,
+            {self._share_of_total('total_policies')} as policy_percentage
+        FROM mv_insurance_type_totals
         ORDER BY total_premium DESC
         """
         return self.db_ops.execute_query(query)
     
+    @cached_result
     def get_district_performance(self, state: str, limit: int = 10) -> pd.DataFrame:
         """Get top performing districts in a state"""
         query = """
@@ -161,7 +262,7 @@ class PhonePeAnalytics:
             SUM(amount) as total_amount,
             AVG(amount) as avg_amount,
             COUNT(DISTINCT year) as years_active,
-            COUNT(DISTINCT quarter) as quarters_active,
+            (MAX(quarter = 1) + MAX(quarter = 2) + MAX(quarter = 3) + MAX(quarter = 4)) as quarters_active,
             ROUND(
                 (SUM(amount) * 100.0 / 
                 (SELECT SUM(amount) FROM map_transaction WHERE state = ?)), 2
@@ -174,79 +275,75 @@ class PhonePeAnalytics:
         """
         return self.db_ops.execute_query(query, (state, state, limit))
     
+    @cached_result
     def get_user_engagement_metrics(self, state: Optional[str] = None) -> pd.DataFrame:
         """Get comprehensive user engagement metrics"""
         if state:
             query = """
             SELECT 
                 district,
-                SUM(registered_users) as total_registered_users,
-                SUM(app_opens) as total_app_opens,
-                ROUND(AVG(CAST(app_opens AS FLOAT) / NULLIF(registered_users, 0)), 2) as avg_opens_per_user,
-                MIN(registered_users) as min_users,
-                MAX(registered_users) as max_users,
-                COUNT(DISTINCT year) as years_active,
-                ROUND(
-                    (SUM(registered_users) * 100.0 / 
-                    (SELECT SUM(registered_users) FROM map_user WHERE state = ?)), 2
-                ) as district_user_percentage
+                year,
+                registered_users,
+                app_opens
             FROM map_user
             WHERE state = ?
-            GROUP BY district
-            ORDER BY total_registered_users DESC
             """
-            return self.db_ops.execute_query(query, (state, state))
+            df = self.db_ops.execute_query(query, (state,))
         else:
             query = """
             SELECT 
                 state,
-                SUM(registered_users) as total_registered_users,
-                SUM(app_opens) as total_app_opens,
-                ROUND(AVG(CAST(app_opens AS FLOAT) / NULLIF(registered_users, 0)), 2) as avg_opens_per_user,
-                COUNT(DISTINCT district) as districts_covered,
-                COUNT(DISTINCT year) as years_active,
-                ROUND(
-                    (SUM(registered_users) * 100.0 / 
-                    (SELECT SUM(registered_users) FROM map_user)), 2
-                ) as national_user_percentage
+                district,
+                year,
+                registered_users,
+                app_opens
             FROM map_user
-            GROUP BY state
-            ORDER BY total_registered_users DESC
             """
-            return self.db_ops.execute_query(query)
+            df = self.db_ops.execute_query(query)
+        
+        # No early return for empty results: most states have no map_user rows, and callers
+        # still read the aggregated columns below
+        
+        # Opens per user for every row in one pass; rows without users stay NaN like NULLIF
+        users = df['registered_users'].to_numpy(dtype=np.float64)
+        opens = df['app_opens'].to_numpy(dtype=np.float64)
+        opens_per_user = np.full_like(opens, np.nan)
+        np.divide(opens, users, out=opens_per_user, where=users != 0)
+        df['opens_per_user'] = opens_per_user
+        
+        if state:
+            result = df.groupby('district', sort=False).agg(
+                total_registered_users=('registered_users', 'sum'),
+                total_app_opens=('app_opens', 'sum'),
+                avg_opens_per_user=('opens_per_user', 'mean'),
+                min_users=('registered_users', 'min'),
+                max_users=('registered_users', 'max'),
+                years_active=('year', 'nunique')
+            )
+            share_column = 'district_user_percentage'
+        else:
+            result = df.groupby('state', observed=True, sort=False).agg(
+                total_registered_users=('registered_users', 'sum'),
+                total_app_opens=('app_opens', 'sum'),
+                avg_opens_per_user=('opens_per_user', 'mean'),
+                districts_covered=('district', 'nunique'),
+                years_active=('year', 'nunique')
+            )
+            share_column = 'national_user_percentage'
+        
+        result['avg_opens_per_user'] = result['avg_opens_per_user'].round(2)
+        total_users = result['total_registered_users'].sum()
+        result[share_column] = (result['total_registered_users'] * 100.0 / total_users).round(2) if total_users else np.nan
+        
+        return result.reset_index().sort_values('total_registered_users', ascending=False, ignore_index=True)
     
+    @cached_result
     def get_top_pincodes(self, metric: str = 'transaction_amount', limit: int = 20) -> pd.DataFrame:
         """Get top performing pincodes by specified metric"""
-        if metric == 'transaction_amount':
-            query = """
-            SELECT 
-                state,
-                pincode,
-                SUM(transaction_count) as total_transactions,
-                SUM(transaction_amount) as total_amount,
-                AVG(transaction_amount) as avg_amount,
-                COUNT(DISTINCT year) as years_active,
-                COUNT(DISTINCT quarter) as quarters_active
-            FROM top_transaction
-            GROUP BY state, pincode
-            ORDER BY total_amount DESC
-            LIMIT ?
-            """
-        else:  # registered_users
-            query = """
-            SELECT 
-                state,
-                pincode,
-                SUM(registered_users) as total_users,
-                COUNT(DISTINCT year) as years_active,
-                COUNT(DISTINCT quarter) as quarters_active
-            FROM top_user
-            GROUP BY state, pincode
-            ORDER BY total_users DESC
-            LIMIT ?
-            """
+        query = self.TOP_PINCODE_QUERIES.get(metric, self.TOP_PINCODE_QUERIES['registered_users'])
         return self.db_ops.execute_query(query, (limit,))
     
+    @cached_result
     def get_growth_analysis(self) -> pd.DataFrame:
         """Comprehensive year-over-year growth analysis"""
         query = """
@@ -262,15 +359,16 @@ class PhonePeAnalytics:
         ),
         growth_calc AS (
             SELECT 
-                year,
-                total_transactions,
-                total_amount,
-                active_states,
-                active_types,
-                LAG(total_amount) OVER (ORDER BY year) as prev_year_amount,
-                LAG(total_transactions) OVER (ORDER BY year) as prev_year_transactions,
-                LAG(active_states) OVER (ORDER BY year) as prev_year_states
-            FROM yearly_data
+                y.year,
+                y.total_transactions,
+                y.total_amount,
+                y.active_states,
+                y.active_types,
+                p.total_amount as prev_year_amount,
+                p.total_transactions as prev_year_transactions,
+                p.active_states as prev_year_states
+            FROM yearly_data y
+            LEFT JOIN yearly_data p ON p.year = y.year - 1
         )
         SELECT 
             year,
@@ -298,69 +396,56 @@ class PhonePeAnalytics:
         """
         return self.db_ops.execute_query(query)
     
+    @cached_result
     def get_seasonal_analysis(self) -> pd.DataFrame:
         """Analyze seasonal patterns in transactions (SQLite compatible)"""
         query = """
         SELECT 
             quarter,
-            AVG(transaction_count) as avg_transactions,
-            AVG(transaction_amount) as avg_amount,
-            MIN(transaction_amount) as min_amount,
-            MAX(transaction_amount) as max_amount,
-            COUNT(DISTINCT state) as states_active,
-            COUNT(DISTINCT year) as years_analyzed
-        FROM aggregated_transaction
-        GROUP BY quarter
+            avg_transactions,
+            avg_amount,
+            min_amount,
+            max_amount,
+            states_active,
+            years_analyzed
+        FROM mv_quarter_totals
         ORDER BY quarter
         """
         return self.db_ops.execute_query(query)
     
+    @cached_result
     def get_market_concentration_analysis(self) -> pd.DataFrame:
         """Analyze market concentration using Pareto principle"""
         query = """
-        WITH state_totals AS (
-            SELECT 
-                state,
-                SUM(transaction_amount) as total_amount
-            FROM aggregated_transaction
-            GROUP BY state
-        ),
-        ranked_states AS (
-            SELECT 
-                state,
-                total_amount,
-                ROW_NUMBER() OVER (ORDER BY total_amount DESC) as rank,
-                SUM(total_amount) OVER () as grand_total
-            FROM state_totals
-        ),
-        cumulative_analysis AS (
-            SELECT 
-                rank,
-                state,
-                total_amount,
-                ROUND((total_amount * 100.0 / grand_total), 2) as individual_percentage,
-                ROUND((SUM(total_amount) OVER (ORDER BY rank) * 100.0 / grand_total), 2) as cumulative_percentage
-            FROM ranked_states
-        )
         SELECT 
-            rank,
             state,
-            total_amount,
-            individual_percentage,
-            cumulative_percentage,
-            CASE 
-                WHEN cumulative_percentage <= 80 THEN 'Top 80%'
-                WHEN cumulative_percentage <= 95 THEN 'Next 15%'
-                ELSE 'Bottom 5%'
-            END as market_segment
-        FROM cumulative_analysis
-        ORDER BY rank
+            total_amount
+        FROM mv_state_totals
+        ORDER BY total_amount DESC
         """
-        return self.db_ops.execute_query(query)
+        df = self.db_ops.execute_query(query)
+        # Running share over the already-sorted amounts replaces the SQL window sums; empty results keep every column
+        amounts = df['total_amount'].to_numpy(dtype=np.float64)
+        grand_total = amounts.sum()
+        if grand_total == 0:
+            grand_total = np.nan
+        
+        individual_percentage = np.round(amounts * 100.0 / grand_total, 2)
+        cumulative_percentage = np.round(np.cumsum(amounts) * 100.0 / grand_total, 2)
+        
+        df.insert(0, 'rank', np.arange(1, len(df) + 1))
+        df['individual_percentage'] = individual_percentage
+        df['cumulative_percentage'] = cumulative_percentage
+        df['market_segment'] = pd.Categorical(np.select(
+            [cumulative_percentage <= 80, cumulative_percentage <= 95],
+            ['Top 80%', 'Next 15%'],
+            'Bottom 5%'
+        ))
+        return df
     
+    @cached_result
     def get_comprehensive_state_report(self, state: str) -> Dict[str, pd.DataFrame]:
         """Get comprehensive report for a specific state"""
-        report = {}
         
         # Transaction analysis by type and time
         query1 = """
@@ -376,7 +461,6 @@ class PhonePeAnalytics:
         GROUP BY year, quarter, transaction_type
         ORDER BY year, quarter, amount DESC
         """
-        report['transactions'] = self.db_ops.execute_query(query1, (state,))
         
         # User brand preferences over time
         query2 = """
@@ -392,12 +476,11 @@ class PhonePeAnalytics:
         GROUP BY year, brands
         ORDER BY year, total_users DESC
         """
-        report['users'] = self.db_ops.execute_query(query2, (state,))
         
         # District-wise performance analysis
         query3 = """
         SELECT 
-            district,
+            mt.district,
             SUM(mt.count) as total_transactions,
             SUM(mt.amount) as total_amount,
             AVG(mt.amount) as avg_amount,
@@ -408,10 +491,9 @@ class PhonePeAnalytics:
         LEFT JOIN map_user mu ON mt.state = mu.state AND mt.district = mu.district 
             AND mt.year = mu.year AND mt.quarter = mu.quarter
         WHERE mt.state = ?
-        GROUP BY district
+        GROUP BY mt.district
         ORDER BY total_amount DESC
         """
-        report['districts'] = self.db_ops.execute_query(query3, (state,))
         
         # Insurance adoption analysis
         query4 = """
@@ -426,12 +508,11 @@ class PhonePeAnalytics:
         GROUP BY year, insurance_type
         ORDER BY year, premium DESC
         """
-        report['insurance'] = self.db_ops.execute_query(query4, (state,))
         
         # Top performing pincodes
         query5 = """
         SELECT 
-            pincode,
+            tt.pincode,
             SUM(tt.transaction_count) as total_transactions,
             SUM(tt.transaction_amount) as total_amount,
             SUM(tu.registered_users) as total_users
@@ -439,175 +520,169 @@ class PhonePeAnalytics:
         LEFT JOIN top_user tu ON tt.state = tu.state AND tt.pincode = tu.pincode 
             AND tt.year = tu.year AND tt.quarter = tu.quarter
         WHERE tt.state = ?
-        GROUP BY pincode
+        GROUP BY tt.pincode
         ORDER BY total_amount DESC
         LIMIT 10
         """
-        report['top_pincodes'] = self.db_ops.execute_query(query5, (state,))
         
-        return report
+        # The five sections are independent, so run them concurrently
+        return self.db_ops.execute_queries_parallel({
+            'transactions': (query1, (state,)),
+            'users': (query2, (state,)),
+            'districts': (query3, (state,)),
+            'insurance': (query4, (state,)),
+            'top_pincodes': (query5, (state,))
+        })
     
     def get_correlation_analysis(self) -> pd.DataFrame:
         """Analyze correlations between different metrics"""
-        query = """
-        SELECT 
-            at.state,
-            at.year,
-            at.quarter,
-            SUM(at.transaction_amount) as transaction_amount,
-            SUM(at.transaction_count) as transaction_count,
-            AVG(au.count) as avg_user_count,
-            SUM(ai.insurance_amount) as insurance_amount,
-            SUM(mu.registered_users) as registered_users,
-            SUM(mu.app_opens) as app_opens
-        FROM aggregated_transaction at
-        LEFT JOIN aggregated_user au ON at.state = au.state AND at.year = au.year AND at.quarter = au.quarter
-        LEFT JOIN aggregated_insurance ai ON at.state = ai.state AND at.year = ai.year AND at.quarter = ai.quarter
-        LEFT JOIN (
-            SELECT state, year, quarter, SUM(registered_users) as registered_users, SUM(app_opens) as app_opens
+        # The result has one row per (state, year, quarter), small enough that it is always
+        # returned whole; streaming would only pay off if the merge itself ran per key range
+        # Aggregate each table to one row per (state, year, quarter) before merging, so
+        # the sums are not multiplied by the row counts of the other tables
+        queries = {
+            'transactions': ("""
+            SELECT state, year, quarter,
+                   SUM(transaction_amount) as transaction_amount,
+                   SUM(transaction_count) as transaction_count
+            FROM aggregated_transaction
+            GROUP BY state, year, quarter
+            """, None),
+            'users': ("""
+            SELECT state, year, quarter, AVG(count) as avg_user_count
+            FROM aggregated_user
+            GROUP BY state, year, quarter
+            """, None),
+            'insurance': ("""
+            SELECT state, year, quarter, SUM(insurance_amount) as insurance_amount
+            FROM aggregated_insurance
+            GROUP BY state, year, quarter
+            """, None),
+            'map_users': ("""
+            SELECT state, year, quarter,
+                   SUM(registered_users) as registered_users,
+                   SUM(app_opens) as app_opens
             FROM map_user
             GROUP BY state, year, quarter
-        ) mu ON at.state = mu.state AND at.year = mu.year AND at.quarter = mu.quarter
-        GROUP BY at.state, at.year, at.quarter
-        ORDER BY at.state, at.year, at.quarter
-        """
-        return self.db_ops.execute_query(query)
+            """, None)
+        }
+        frames = self.db_ops.execute_queries_parallel(queries)
+        
+        keys = ['state', 'year', 'quarter']
+        result = frames['transactions']
+        if not result.empty:
+            result['state'] = result['state'].astype(str)
+            for name in ('users', 'insurance', 'map_users'):
+                right = frames[name]
+                if right.empty:
+                    continue
+                right['state'] = right['state'].astype(str)
+                result = result.merge(right, on=keys, how='left', sort=False)
+            result = result.sort_values(keys, ignore_index=True)
+            result['state'] = result['state'].astype('category')
+        
+        return result
     
+    @cached_result
     def get_advanced_kpis(self) -> Dict[str, Any]:
         """Calculate advanced KPIs and business metrics"""
         kpis = {}
         
-        # Transaction velocity (transactions per day)
-        query1 = """
+        # One grouped read per source table; every KPI below is derived from these
+        quarterly = self.db_ops.execute_query("""
         SELECT 
-            AVG(transaction_count) as avg_daily_transactions,
-            AVG(transaction_amount) as avg_daily_amount
-        FROM (
-            SELECT 
-                state, year, quarter,
-                SUM(transaction_count) / (CASE quarter WHEN 1 THEN 90 WHEN 2 THEN 91 WHEN 3 THEN 92 ELSE 92 END) as transaction_count,
-                SUM(transaction_amount) / (CASE quarter WHEN 1 THEN 90 WHEN 2 THEN 91 WHEN 3 THEN 92 ELSE 92 END) as transaction_amount
-            FROM aggregated_transaction
-            GROUP BY state, year, quarter
-        )
-        """
-        result1 = self.db_ops.execute_query(query1)
-        if not result1.empty:
-            kpis.update(result1.to_dict('records')[0])
-        
-        # Market penetration rate
-        query2 = """
+            state,
+            year,
+            quarter,
+            SUM(transaction_amount) as amount,
+            SUM(transaction_count) as count
+        FROM aggregated_transaction
+        GROUP BY state, year, quarter
+        """)
+        state_users = self.db_ops.execute_query("""
         SELECT 
-            COUNT(DISTINCT state) as total_states,
-            AVG(user_penetration) as avg_user_penetration
-        FROM (
-            SELECT 
-                state,
-                SUM(registered_users) * 100.0 / 1000000 as user_penetration  -- Assuming 1M potential users per state
-            FROM map_user
-            GROUP BY state
-        )
-        """
-        result2 = self.db_ops.execute_query(query2)
-        if not result2.empty:
-            kpis.update(result2.to_dict('records')[0])
+            state,
+            SUM(registered_users) as registered_users
+        FROM map_user
+        GROUP BY state
+        """)
+        
+        # Transaction velocity (transactions per day)
+        if not quarterly.empty:
+            days = quarterly['quarter'].map(self.DAYS_IN_QUARTER)
+            kpis['avg_daily_transactions'] = float((quarterly['count'] / days).mean())
+            kpis['avg_daily_amount'] = float((quarterly['amount'] / days).mean())
+        
+        # Market penetration rate (assuming 1M potential users per state)
+        if not state_users.empty:
+            kpis['total_states'] = int(state_users['state'].nunique())
+            kpis['avg_user_penetration'] = float((state_users['registered_users'] * 100.0 / 1000000).mean())
         
         # Customer lifetime value proxy
-        query3 = """
-        SELECT 
-            AVG(customer_value) as avg_customer_lifetime_value
-        FROM (
-            SELECT 
-                state,
-                SUM(transaction_amount) / NULLIF(SUM(registered_users), 0) as customer_value
-            FROM aggregated_transaction at
-            JOIN (
-                SELECT state, SUM(registered_users) as registered_users
-                FROM map_user
-                GROUP BY state
-            ) mu ON at.state = mu.state
-            GROUP BY at.state
-        )
-        """
-        result3 = self.db_ops.execute_query(query3)
-        if not result3.empty:
-            kpis.update(result3.to_dict('records')[0])
+        if not quarterly.empty and not state_users.empty:
+            state_amounts = quarterly.groupby('state', observed=True, sort=False)['amount'].sum()
+            users = state_users.set_index('state')['registered_users'].replace(0, np.nan)
+            customer_value = (state_amounts / users).dropna()
+            if not customer_value.empty:
+                kpis['avg_customer_lifetime_value'] = float(customer_value.mean())
         
         return kpis
     
+    @cached_result
     def get_competitive_analysis(self) -> pd.DataFrame:
         """Analyze competitive position across states"""
         query = """
-        WITH state_metrics AS (
-            SELECT 
-                state,
-                SUM(transaction_amount) as total_amount,
-                SUM(transaction_count) as total_transactions,
-                COUNT(DISTINCT transaction_type) as transaction_diversity,
-                AVG(transaction_amount) as avg_transaction_size
-            FROM aggregated_transaction
-            GROUP BY state
-        ),
-        ranked_metrics AS (
-            SELECT 
-                state,
-                total_amount,
-                total_transactions,
-                transaction_diversity,
-                avg_transaction_size,
-                RANK() OVER (ORDER BY total_amount DESC) as amount_rank,
-                RANK() OVER (ORDER BY total_transactions DESC) as volume_rank,
-                RANK() OVER (ORDER BY transaction_diversity DESC) as diversity_rank,
-                RANK() OVER (ORDER BY avg_transaction_size DESC) as size_rank
-            FROM state_metrics
-        )
         SELECT 
             state,
             total_amount,
             total_transactions,
-            transaction_diversity,
-            avg_transaction_size,
-            amount_rank,
-            volume_rank,
-            diversity_rank,
-            size_rank,
-            ROUND((amount_rank + volume_rank + diversity_rank + size_rank) / 4.0, 2) as overall_score
-        FROM ranked_metrics
-        ORDER BY overall_score
+            transaction_types as transaction_diversity,
+            avg_amount as avg_transaction_size
+        FROM mv_state_totals
         """
-        return self.db_ops.execute_query(query)
+        df = self.db_ops.execute_query(query)
+        # pandas rank(method='min') matches SQL RANK() without a sort per window; empty results keep the rank columns
+        rank_columns = {
+            'amount_rank': 'total_amount',
+            'volume_rank': 'total_transactions',
+            'diversity_rank': 'transaction_diversity',
+            'size_rank': 'avg_transaction_size'
+        }
+        for rank_column, metric_column in rank_columns.items():
+            df[rank_column] = df[metric_column].rank(ascending=False, method='min').astype(int)
+        
+        df['overall_score'] = df[list(rank_columns)].mean(axis=1).round(2)
+        return df.sort_values('overall_score', ignore_index=True)
     
+    @cached_result
     def get_fraud_risk_indicators(self) -> pd.DataFrame:
-        """Identify potential fraud risk indicators (SQLite compatible)"""
+        """Identify potential fraud risk indicators"""
         query = """
-        WITH transaction_stats AS (
-            SELECT 
-                state,
-                transaction_type,
-                AVG(transaction_amount) as avg_amount,
-                MAX(transaction_amount) as max_amount,
-                MIN(transaction_amount) as min_amount,
-                COUNT(*) as transaction_frequency
-            FROM aggregated_transaction
-            GROUP BY state, transaction_type
-        )
         SELECT 
             state,
             transaction_type,
-            avg_amount,
-            max_amount,
-            min_amount,
-            transaction_frequency,
-            CASE 
-                WHEN max_amount > (avg_amount * 3) THEN 'High Risk'
-                WHEN max_amount > (avg_amount * 2) THEN 'Medium Risk'
-                ELSE 'Low Risk'
-            END as risk_level,
-            ROUND((max_amount - avg_amount) / NULLIF(avg_amount, 0) * 100, 2) as deviation_percentage
-        FROM transaction_stats
-        ORDER BY deviation_percentage DESC
+            AVG(transaction_amount) as avg_amount,
+            MAX(transaction_amount) as max_amount,
+            MIN(transaction_amount) as min_amount,
+            COUNT(*) as transaction_frequency
+        FROM aggregated_transaction
+        GROUP BY state, transaction_type
         """
-        return self.db_ops.execute_query(query)
+        df = self.db_ops.execute_query(query)
+        # Risk buckets and deviation computed over whole columns at once; empty results still get both columns
+        avg_amount = df['avg_amount'].to_numpy(dtype=np.float64)
+        max_amount = df['max_amount'].to_numpy(dtype=np.float64)
+        
+        df['risk_level'] = pd.Categorical(np.where(
+            max_amount > avg_amount * 3, 'High Risk',
+            np.where(max_amount > avg_amount * 2, 'Medium Risk', 'Low Risk')
+        ))
+        
+        deviation = np.full_like(avg_amount, np.nan)
+        np.divide(max_amount - avg_amount, avg_amount, out=deviation, where=avg_amount != 0)
+        df['deviation_percentage'] = np.round(deviation * 100, 2)
+        
+        return df.sort_values('deviation_percentage', ascending=False, ignore_index=True)
     
     def close_connection(self):
         """Close database connection"""
@@ -617,6 +692,7 @@ class PhonePeAnalytics:
 class AdvancedAnalytics(PhonePeAnalytics):
     """Extended analytics class with advanced statistical methods"""
     
+    @cached_result
     def get_time_series_forecast_data(self, state: str) -> pd.DataFrame:
         """Prepare data for time series forecasting"""
         query = """
@@ -633,6 +709,7 @@ class AdvancedAnalytics(PhonePeAnalytics):
         """
         return self.db_ops.execute_query(query, (state,))
     
+    @cached_result
     def get_cohort_analysis_data(self) -> pd.DataFrame:
         """Prepare data for cohort analysis"""
         query = """
@@ -667,42 +744,27 @@ class AdvancedAnalytics(PhonePeAnalytics):
         """
         return self.db_ops.execute_query(query)
     
+    @cached_result
     def get_anomaly_detection_data(self) -> pd.DataFrame:
-        """Identify anomalies in transaction patterns (SQLite compatible)"""
+        """Identify anomalies in transaction patterns"""
         query = """
-        WITH monthly_stats AS (
-            SELECT 
-                state,
-                year,
-                quarter,
-                SUM(transaction_amount) as amount,
-                SUM(transaction_count) as count
-            FROM aggregated_transaction
-            GROUP BY state, year, quarter
-        ),
-        state_averages AS (
-            SELECT 
-                state,
-                AVG(amount) as avg_amount,
-                AVG(count) as avg_count
-            FROM monthly_stats
-            GROUP BY state
-        )
         SELECT 
-            ms.state,
-            ms.year,
-            ms.quarter,
-            ms.amount,
-            ms.count,
-            sa.avg_amount,
-            ABS(ms.amount - sa.avg_amount) / NULLIF(sa.avg_amount, 0) * 100 as amount_deviation_percent,
-            ABS(ms.count - sa.avg_count) / NULLIF(sa.avg_count, 0) * 100 as count_deviation_percent,
-            CASE 
-                WHEN ABS(ms.amount - sa.avg_amount) / NULLIF(sa.avg_amount, 0) > 2 THEN 'Anomaly'
-                ELSE 'Normal'
-            END as anomaly_flag
-        FROM monthly_stats ms
-        JOIN state_averages sa ON ms.state = sa.state
-        ORDER BY amount_deviation_percent DESC
+            state,
+            year,
+            quarter,
+            SUM(transaction_amount) as amount,
+            SUM(transaction_count) as count
+        FROM aggregated_transaction
+        GROUP BY state, year, quarter
         """
-        return self.db_ops.execute_query(query)
\ No newline at end of file
+        df = self.db_ops.execute_query(query)
+        # Broadcast each state's average back onto its quarters instead of a SQL join; empty results still get every derived column
+        means = df.groupby('state', observed=True, sort=False)[['amount', 'count']].transform('mean')
+        deviation = (df[['amount', 'count']] - means).abs() / means.where(means != 0) * 100
+        
+        df['avg_amount'] = means['amount']
+        df['amount_deviation_percent'] = deviation['amount']
+        df['count_deviation_percent'] = deviation['count']
+        df['anomaly_flag'] = pd.Categorical(np.where(deviation['amount'] > 200, 'Anomaly', 'Normal'))
+        
+        return df.sort_values('amount_deviation_percent', ascending=False, ignore_index=True)
@@ -1,5 +1,4 @@
 import sys
-import os
 from pathlib import Path
 
 # Add project root to Python path
@@ -8,12 +7,10 @@ sys.path.insert(0, str(project_root))
 
 import streamlit as st
 import pandas as pd
-import plotly.express as px
 import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-import numpy as np
+from typing import Dict, Any, Optional, List
 from analytics.queries import PhonePeAnalytics
-from utils.helpers import format_currency, format_number
+from utils.helpers import format_currency, format_number, downsample_lttb
 
 # Page configuration
 st.set_page_config(
@@ -48,9 +45,207 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# Seconds a cached query result is reused across reruns
+CACHE_TTL = 3600
+
+# plotly.js config for display-only panels: no event binding, hit-testing or mode bar
+STATIC_CHART_CONFIG = {'staticPlot': True, 'displayModeBar': False}
+
+# Upper bound on points per line series sent to the browser
+MAX_LINE_POINTS = 500
+
+# The leading underscore keeps Streamlit from hashing the analytics object; results are keyed
+# on the remaining arguments, which start with the database's data version so a load committed
+# by any connection or process shows up on the next rerun instead of after the TTL
+@st.cache_data(ttl=CACHE_TTL)
+def cached_transaction_overview(_analytics: PhonePeAnalytics, data_version: tuple) -> Dict[str, Any]:
+    """Cached overall transaction statistics"""
+    return _analytics.get_transaction_overview()
+
+@st.cache_data(ttl=CACHE_TTL)
+def cached_state_wise_analysis(_analytics: PhonePeAnalytics, data_version: tuple, limit: int = 10) -> pd.DataFrame:
+    """Cached state-wise transaction analysis"""
+    return _analytics.get_state_wise_analysis(limit)
+
+@st.cache_data(ttl=CACHE_TTL)
+def cached_state_names(_analytics: PhonePeAnalytics, data_version: tuple) -> List[str]:
+    """Cached list of state names"""
+    return _analytics.get_state_names()
+
+@st.cache_data(ttl=CACHE_TTL)
+def cached_transaction_type_analysis(_analytics: PhonePeAnalytics, data_version: tuple) -> pd.DataFrame:
+    """Cached transaction type analysis"""
+    return _analytics.get_transaction_type_analysis()
+
+@st.cache_data(ttl=CACHE_TTL)
+def cached_insurance_insights(_analytics: PhonePeAnalytics, data_version: tuple) -> pd.DataFrame:
+    """Cached insurance insights"""
+    return _analytics.get_insurance_insights()
+
+@st.cache_data(ttl=CACHE_TTL)
+def cached_growth_analysis(_analytics: PhonePeAnalytics, data_version: tuple) -> pd.DataFrame:
+    """Cached year-over-year growth analysis"""
+    return _analytics.get_growth_analysis()
+
+@st.cache_data(ttl=CACHE_TTL)
+def cached_dashboard_bundle(_analytics: PhonePeAnalytics, data_version: tuple, state_limit: int = 10) -> Dict[str, Any]:
+    """Cached overview page results, fetched together"""
+    return _analytics.get_dashboard_bundle(state_limit)
+
+@st.cache_data(ttl=CACHE_TTL)
+def cached_user_analytics_bundle(_analytics: PhonePeAnalytics, data_version: tuple, brand_limit: int = 10) -> Dict[str, pd.DataFrame]:
+    """Cached user analytics page results, fetched together"""
+    return _analytics.get_user_analytics_bundle(brand_limit)
+
+@st.cache_data(ttl=CACHE_TTL)
+def cached_comprehensive_state_report(_analytics: PhonePeAnalytics, data_version: tuple, state: str) -> Dict[str, pd.DataFrame]:
+    """Cached comprehensive report for a state"""
+    return _analytics.get_comprehensive_state_report(state)
+
+# Tables whose row counts are shown in the debug panel
+DEBUG_TABLES = ('aggregated_transaction', 'aggregated_user', 'aggregated_insurance')
+
+@st.cache_data(ttl=300)
+def cached_table_counts(_analytics: PhonePeAnalytics, data_version: tuple, tables: tuple) -> Dict[str, int]:
+    """Row counts for the given tables, read in a single UNION ALL query"""
+    query = " UNION ALL ".join(
+        f"SELECT '{table}' as table_name, COUNT(*) as count FROM {table}" for table in tables
+    )
+    result = _analytics.db_ops.execute_query(query)
+    if result.empty:
+        return {}
+    return dict(zip(result['table_name'], result['count'].astype(int)))
+
+def bar_figure(data: pd.DataFrame, x: str, y: str, title: Optional[str] = None, color: Optional[str] = None,
+               color_continuous_scale: Optional[str] = None, orientation: Optional[str] = None) -> go.Figure:
+    """Bar chart built directly on graph_objects, skipping plotly.express preprocessing"""
+    marker = {}
+    if color is not None:
+        marker = dict(
+            color=data[color].to_numpy(),
+            colorscale=color_continuous_scale,
+            showscale=True,
+            colorbar=dict(title=color)
+        )
+    fig = go.Figure(go.Bar(
+        x=data[x].to_numpy(),
+        y=data[y].to_numpy(),
+        orientation=orientation,
+        marker=marker
+    ))
+    fig.update_layout(title=title, xaxis_title=x, yaxis_title=y)
+    return fig
+
+def pie_figure(data: pd.DataFrame, values: str, names: str, title: Optional[str] = None) -> go.Figure:
+    """Pie chart built directly on graph_objects, skipping plotly.express preprocessing"""
+    fig = go.Figure(go.Pie(labels=data[names].to_numpy(), values=data[values].to_numpy()))
+    fig.update_layout(title=title)
+    return fig
+
+def compact_numeric(data: pd.DataFrame) -> pd.DataFrame:
+    """Shrink numeric columns for chart payloads: smallest lossless integer type, floats to 2 decimals"""
+    compact = data.copy()
+    for column in compact.select_dtypes('integer').columns:
+        compact[column] = pd.to_numeric(compact[column], downcast='integer')
+    float_columns = compact.select_dtypes('floating').columns
+    compact[float_columns] = compact[float_columns].round(2)
+    return compact
+
+def express_figure(kind: str):
+    """plotly.express constructor, imported only once a page draws such a chart"""
+    def build(data: pd.DataFrame, **kwargs) -> go.Figure:
+        import plotly.express as px
+        return getattr(px, kind)(data, **kwargs)
+    return build
+
+# Figure constructors available to build_chart
+CHART_BUILDERS = {
+    'bar': bar_figure,
+    'pie': pie_figure,
+    'line': express_figure('line'),
+    'scatter': express_figure('scatter')
+}
+
+@st.cache_resource(ttl=CACHE_TTL)
+def build_chart(kind: str, data: pd.DataFrame, height: Optional[int] = None,
+                tickangle: Optional[int] = None, yaxis_title: Optional[str] = None, **kwargs) -> go.Figure:
+    """Build a figure once per data and chart options"""
+    fig = CHART_BUILDERS[kind](compact_numeric(data), **kwargs)
+    if tickangle is not None:
+        fig.update_xaxes(tickangle=tickangle)
+    if yaxis_title:
+        fig.update_yaxes(title=yaxis_title)
+    if height:
+        fig.update_layout(height=height)
+    return fig
+
+# Counts and rupee amounts are rendered server-side with grouping commas, because
+# NumberColumn's printf formats (streamlit 1.28) have no thousands separator
+COUNT_FORMAT = '{:,}'
+AMOUNT_FORMAT = '₹{:,.2f}'
+
+TRANSACTION_TYPE_FORMATS = {
+    'total_transactions': COUNT_FORMAT,
+    'total_amount': AMOUNT_FORMAT,
+    'avg_amount': AMOUNT_FORMAT
+}
+
+ENGAGEMENT_FORMATS = {
+    'total_registered_users': COUNT_FORMAT,
+    'total_app_opens': COUNT_FORMAT
+}
+
+GROWTH_FORMATS = {
+    'total_transactions': COUNT_FORMAT,
+    'total_amount': AMOUNT_FORMAT,
+    'active_states': COUNT_FORMAT
+}
+
+# Remaining numeric columns stay numbers and are formatted client-side by the Arrow data grid
+PERCENT_COLUMN = st.column_config.NumberColumn(format='%.2f%%')
+
+TRANSACTION_TYPE_COLUMNS = {
+    'percentage_of_total': PERCENT_COLUMN
+}
+
+ENGAGEMENT_COLUMNS = {
+    'avg_opens_per_user': st.column_config.NumberColumn(format='%.2f')
+}
+
+GROWTH_COLUMNS = {
+    'amount_growth_percent': PERCENT_COLUMN,
+    'transaction_growth_percent': PERCENT_COLUMN
+}
+
+@st.cache_data(ttl=CACHE_TTL)
+def format_for_display(data: pd.DataFrame, formats: Dict[str, str]) -> pd.DataFrame:
+    """Render the given numeric columns as formatted strings once per data and format spec"""
+    display = data.copy()
+    for column, fmt in formats.items():
+        if column in display.columns:
+            display[column] = display[column].map(fmt.format, na_action='ignore')
+    return display
+
+@st.cache_resource
+def get_analytics() -> PhonePeAnalytics:
+    """Analytics instance shared by every rerun and session of this server"""
+    analytics = PhonePeAnalytics()
+    # Only writes when the database predates the current indexes or roll-up tables
+    analytics.db_ops.migrate()
+    return analytics
+
 class PhonePeDashboard:
     def __init__(self):
-        self.analytics = PhonePeAnalytics()
+        self.analytics = get_analytics()
+        # Read once per rerun; part of every cached_* key
+        self.data_version = self.analytics.db_ops.get_data_version()
+        self._overview: Optional[Dict[str, Any]] = None
+    
+    def get_overview(self) -> Dict[str, Any]:
+        """Overview stats shared by the sidebar and the overview page within one rerun"""
+        if self._overview is None:
+            self._overview = cached_transaction_overview(self.analytics, self.data_version)
+        return self._overview
         
     def main(self):
         """Main dashboard function"""
@@ -108,8 +303,8 @@ class PhonePeDashboard:
                     st.subheader(f"📊 {page_name} - Basic View")
                     st.dataframe(df)
                     
-                    fig = px.bar(df, x='state', y='total_amount', 
-                            title=f"{page_name} - Top States by Transaction Amount")
+                    fig = bar_figure(df, x='state', y='total_amount',
+                                     title=f"{page_name} - Top States by Transaction Amount")
                     fig.update_xaxes(tickangle=45)
                     st.plotly_chart(fig, use_container_width=True)
                 else:
@@ -124,7 +319,7 @@ class PhonePeDashboard:
         
         try:
             # Get transaction type data with error checking
-            type_data = self.analytics.get_transaction_type_analysis()
+            type_data = cached_transaction_type_analysis(self.analytics, self.data_version)
             
             if type_data.empty:
                 st.warning("⚠️ No transaction data available. Please check database connection.")
@@ -136,52 +331,41 @@ class PhonePeDashboard:
             with col1:
                 st.markdown("### Transaction Types Performance")
                 try:
-                    fig = px.bar(
+                    fig = build_chart(
+                        'bar',
                         type_data,
                         x='transaction_type',
                         y='total_amount',
                         title="Transaction Amount by Type",
                         color='avg_amount',
-                        color_continuous_scale='plasma'
+                        color_continuous_scale='plasma',
+                        tickangle=45,
+                        height=400
                     )
-                    fig.update_xaxes(tickangle=45)
-                    fig.update_layout(height=400)
                     st.plotly_chart(fig, use_container_width=True)
                 except Exception as chart_error:
                     st.error(f"Chart error: {str(chart_error)}")
-                    # Fallback to simple chart
-                    fig = px.bar(type_data, x='transaction_type', y='total_amount')
-                    st.plotly_chart(fig, use_container_width=True)
             
             with col2:
                 st.markdown("### Transaction Distribution")
                 try:
-                    fig = px.pie(
+                    fig = build_chart(
+                        'pie',
                         type_data,
                         values='total_amount',
                         names='transaction_type',
-                        title="Transaction Amount Distribution"
+                        title="Transaction Amount Distribution",
+                        height=400
                     )
-                    fig.update_layout(height=400)
-                    st.plotly_chart(fig, use_container_width=True)
+                    st.plotly_chart(fig, use_container_width=True, config=STATIC_CHART_CONFIG)
                 except Exception as chart_error:
                     st.error(f"Chart error: {str(chart_error)}")
             
             # Data table with safe formatting
             st.markdown("### 📋 Detailed Transaction Analysis")
             try:
-                # Safe column formatting
-                format_dict = {}
-                if 'total_transactions' in type_data.columns:
-                    format_dict['total_transactions'] = '{:,}'
-                if 'total_amount' in type_data.columns:
-                    format_dict['total_amount'] = '₹{:,.2f}'
-                if 'avg_amount' in type_data.columns:
-                    format_dict['avg_amount'] = '₹{:,.2f}'
-                if 'percentage_of_total' in type_data.columns:
-                    format_dict['percentage_of_total'] = '{:.2f}%'
-                
-                st.dataframe(type_data.style.format(format_dict), use_container_width=True)
+                st.dataframe(format_for_display(type_data, TRANSACTION_TYPE_FORMATS), column_config=TRANSACTION_TYPE_COLUMNS,
+                             use_container_width=True)
             except Exception as table_error:
                 st.warning("Showing raw data due to formatting error")
                 st.dataframe(type_data, use_container_width=True)
@@ -198,24 +382,26 @@ class PhonePeDashboard:
         st.markdown("## 👥 User Analytics")
         
         try:
-            # Brand analysis with error checking
+            # One bundled read serves both brand charts and the engagement section
+            bundle = cached_user_analytics_bundle(self.analytics, self.data_version, 10)
+            brand_data = bundle['brands']
             col1, col2 = st.columns(2)
             
             with col1:
                 st.markdown("### 📱 Device Brand Analysis")
                 try:
-                    brand_data = self.analytics.get_brand_analysis(15)
                     if not brand_data.empty:
-                        fig = px.bar(
-                            brand_data.head(10),  # Limit to top 10 for better display
+                        fig = build_chart(
+                            'bar',
+                            brand_data,
                             x='brands',
                             y='total_users',
                             title="User Distribution by Device Brand",
                             color='total_users',
-                            color_continuous_scale='viridis'
+                            color_continuous_scale='viridis',
+                            tickangle=45,
+                            height=400
                         )
-                        fig.update_xaxes(tickangle=45)
-                        fig.update_layout(height=400)
                         st.plotly_chart(fig, use_container_width=True)
                     else:
                         st.warning("No brand data available")
@@ -225,16 +411,16 @@ class PhonePeDashboard:
             with col2:
                 st.markdown("### 🎯 Market Share Overview")
                 try:
-                    brand_data = self.analytics.get_brand_analysis(10)
                     if not brand_data.empty:
-                        fig = px.pie(
+                        fig = build_chart(
+                            'pie',
                             brand_data.head(8),
                             values='total_users',
                             names='brands',
-                            title="Market Share by Brand"
+                            title="Market Share by Brand",
+                            height=400
                         )
-                        fig.update_layout(height=400)
-                        st.plotly_chart(fig, use_container_width=True)
+                        st.plotly_chart(fig, use_container_width=True, config=STATIC_CHART_CONFIG)
                     else:
                         st.warning("No market share data available")
                 except Exception as e:
@@ -243,31 +429,26 @@ class PhonePeDashboard:
             # User engagement with simplified query
             st.markdown("### 📈 User Engagement by State")
             try:
-                engagement_data = self.analytics.get_user_engagement_metrics()
+                engagement_data = bundle['engagement']
                 if not engagement_data.empty:
                     # Simple bar chart for engagement
                     top_states = engagement_data.head(15)
-                    fig = px.bar(
+                    fig = build_chart(
+                        'bar',
                         top_states,
                         x='state',
                         y='total_registered_users',
                         title="Registered Users by State",
                         color='total_registered_users',
-                        color_continuous_scale='blues'
+                        color_continuous_scale='blues',
+                        tickangle=45
                     )
-                    fig.update_xaxes(tickangle=45)
                     st.plotly_chart(fig, use_container_width=True)
                     
                     # Data table
                     st.markdown("#### 📋 User Engagement Data")
-                    format_dict = {
-                        'total_registered_users': '{:,}',
-                        'total_app_opens': '{:,}'
-                    }
-                    if 'avg_opens_per_user' in engagement_data.columns:
-                        format_dict['avg_opens_per_user'] = '{:.2f}'
-                    
-                    st.dataframe(engagement_data.style.format(format_dict), use_container_width=True)
+                    st.dataframe(format_for_display(engagement_data, ENGAGEMENT_FORMATS), column_config=ENGAGEMENT_COLUMNS,
+                                 use_container_width=True)
                 else:
                     st.warning("No engagement data available")
             except Exception as e:
@@ -286,15 +467,12 @@ class PhonePeDashboard:
                 st.write("Database stats:", overview)
                 
                 # Check data availability
-                tables = ['aggregated_transaction', 'aggregated_user', 'aggregated_insurance']
-                for table in tables:
-                    try:
-                        query = f"SELECT COUNT(*) as count FROM {table}"
-                        result = self.analytics.db_ops.execute_query(query)
-                        count = result.iloc[0]['count'] if not result.empty else 0
+                counts = cached_table_counts(self.analytics, self.data_version, DEBUG_TABLES)
+                if counts:
+                    for table, count in counts.items():
                         st.write(f"📊 {table}: {count:,} records")
-                    except Exception as e:
-                        st.error(f"❌ {table}: {str(e)}")
+                else:
+                    st.error("❌ Could not read table counts")
                         
             except Exception as e:
                 st.error(f"❌ Debug info error: {str(e)}")
@@ -304,7 +482,7 @@ class PhonePeDashboard:
         st.markdown("## 📈 Growth Analysis")
         
         try:
-            growth_data = self.analytics.get_growth_analysis()
+            growth_data = cached_growth_analysis(self.analytics, self.data_version)
             
             if growth_data.empty:
                 st.warning("⚠️ No growth data available")
@@ -316,30 +494,32 @@ class PhonePeDashboard:
             
             with col1:
                 try:
-                    fig = px.bar(
+                    fig = build_chart(
+                        'bar',
                         growth_data,
                         x='year',
                         y='total_amount',
                         title="Total Transaction Amount by Year",
                         color='total_amount',
-                        color_continuous_scale='blues'
+                        color_continuous_scale='blues',
+                        height=400
                     )
-                    fig.update_layout(height=400)
                     st.plotly_chart(fig, use_container_width=True)
                 except Exception as e:
                     st.error(f"Amount chart error: {str(e)}")
             
             with col2:
                 try:
-                    fig = px.bar(
+                    fig = build_chart(
+                        'bar',
                         growth_data,
                         x='year',
                         y='total_transactions',
                         title="Total Transaction Count by Year",
                         color='total_transactions',
-                        color_continuous_scale='greens'
+                        color_continuous_scale='greens',
+                        height=400
                     )
-                    fig.update_layout(height=400)
                     st.plotly_chart(fig, use_container_width=True)
                 except Exception as e:
                     st.error(f"Count chart error: {str(e)}")
@@ -347,39 +527,42 @@ class PhonePeDashboard:
             # Growth percentage analysis (only if data exists)
             st.markdown("### 📈 Growth Trends")
             
-            # Filter data with growth percentages
-            growth_with_data = growth_data.dropna(subset=['amount_growth_percent', 'transaction_growth_percent'])
+            # Filter data with growth percentages, checking only the two growth columns
+            has_growth = growth_data[['amount_growth_percent', 'transaction_growth_percent']].notna().all(axis=1).to_numpy()
+            growth_with_data = growth_data.iloc[has_growth]
             
             if not growth_with_data.empty:
                 col1, col2 = st.columns(2)
                 
                 with col1:
                     try:
-                        fig = px.line(
-                            growth_with_data,
+                        fig = build_chart(
+                            'line',
+                            downsample_lttb(growth_with_data, 'year', 'amount_growth_percent', MAX_LINE_POINTS),
                             x='year',
                             y='amount_growth_percent',
                             title="Year-over-Year Amount Growth (%)",
-                            markers=True
+                            markers=True,
+                            yaxis_title="Growth Percentage (%)",
+                            height=400
                         )
-                        fig.update_yaxis(title="Growth Percentage (%)")
-                        fig.update_layout(height=400)
                         st.plotly_chart(fig, use_container_width=True)
                     except Exception as e:
                         st.info("Growth trend visualization unavailable")
                 
                 with col2:
                     try:
-                        fig = px.line(
-                            growth_with_data,
+                        fig = build_chart(
+                            'line',
+                            downsample_lttb(growth_with_data, 'year', 'transaction_growth_percent', MAX_LINE_POINTS),
                             x='year',
                             y='transaction_growth_percent',
                             title="Year-over-Year Transaction Growth (%)",
                             markers=True,
-                            line_shape='spline'
+                            line_shape='spline',
+                            yaxis_title="Growth Percentage (%)",
+                            height=400
                         )
-                        fig.update_yaxis(title="Growth Percentage (%)")
-                        fig.update_layout(height=400)
                         st.plotly_chart(fig, use_container_width=True)
                     except Exception as e:
                         st.info("Transaction growth visualization unavailable")
@@ -389,18 +572,8 @@ class PhonePeDashboard:
             # Data table
             st.markdown("### 📋 Detailed Growth Metrics")
             try:
-                format_dict = {
-                    'total_transactions': '{:,}',
-                    'total_amount': '₹{:,.2f}',
-                    'active_states': '{:,}'
-                }
-                # Add growth percentage formatting if columns exist
-                if 'amount_growth_percent' in growth_data.columns:
-                    format_dict['amount_growth_percent'] = '{:.2f}%'
-                if 'transaction_growth_percent' in growth_data.columns:
-                    format_dict['transaction_growth_percent'] = '{:.2f}%'
-                
-                st.dataframe(growth_data.style.format(format_dict), use_container_width=True)
+                st.dataframe(format_for_display(growth_data, GROWTH_FORMATS), column_config=GROWTH_COLUMNS,
+                             use_container_width=True)
             except Exception as e:
                 st.warning("Showing raw growth data")
                 st.dataframe(growth_data, use_container_width=True)
@@ -432,7 +605,7 @@ class PhonePeDashboard:
         st.sidebar.markdown("## 📊 Quick Stats")
         
         # Quick stats
-        overview_data = self.analytics.get_transaction_overview()
+        overview_data = self.get_overview()
         if overview_data:
             st.sidebar.metric(
                 "Total Transactions", 
@@ -455,8 +628,9 @@ class PhonePeDashboard:
         """Render overview dashboard"""
         st.markdown("## 📈 Business Overview")
         
-        # Get overview data
-        overview_data = self.analytics.get_transaction_overview()
+        # Get overview data; the page's charts come from one bundled read
+        overview_data = self.get_overview()
+        bundle = cached_dashboard_bundle(self.analytics, self.data_version, 10)
         
         if overview_data:
             # Key metrics
@@ -495,46 +669,49 @@ class PhonePeDashboard:
         
         with col1:
             st.markdown("### 🏆 Top States by Transaction Volume")
-            state_data = self.analytics.get_state_wise_analysis(10)
+            state_data = bundle['states']
             if not state_data.empty:
-                fig = px.bar(
-                    state_data.head(10),
+                fig = build_chart(
+                    'bar',
+                    state_data,
                     x='total_amount',
                     y='state',
                     orientation='h',
                     title="Top 10 States by Transaction Amount",
                     color='total_amount',
-                    color_continuous_scale='viridis'
+                    color_continuous_scale='viridis',
+                    height=500
                 )
-                fig.update_layout(height=500)
-                st.plotly_chart(fig, use_container_width=True)
+                st.plotly_chart(fig, use_container_width=True, config=STATIC_CHART_CONFIG)
         
         with col2:
             st.markdown("### 📊 Transaction Types Distribution")
-            type_data = self.analytics.get_transaction_type_analysis()
+            type_data = bundle['transaction_types']
             if not type_data.empty:
-                fig = px.pie(
+                fig = build_chart(
+                    'pie',
                     type_data,
                     values='total_amount',
                     names='transaction_type',
-                    title="Transaction Distribution by Type"
+                    title="Transaction Distribution by Type",
+                    height=500
                 )
-                fig.update_layout(height=500)
-                st.plotly_chart(fig, use_container_width=True)
+                st.plotly_chart(fig, use_container_width=True, config=STATIC_CHART_CONFIG)
         
         # Quarterly trends
         st.markdown("### 📅 Quarterly Performance Trends")
-        quarterly_data = self.analytics.get_quarterly_trends()
+        quarterly_data = bundle['quarterly_trends']
         if not quarterly_data.empty:
-            fig = px.line(
-                quarterly_data,
+            fig = build_chart(
+                'line',
+                downsample_lttb(quarterly_data, 'quarter', 'total_amount', MAX_LINE_POINTS, group='year'),
                 x='quarter',
                 y='total_amount',
                 color='year',
                 title="Quarterly Transaction Amount Trends",
-                markers=True
+                markers=True,
+                height=400
             )
-            fig.update_layout(height=400)
             st.plotly_chart(fig, use_container_width=True)
     
     
@@ -542,35 +719,38 @@ class PhonePeDashboard:
         """Render geographic insights dashboard"""
         st.markdown("## 🗺️ Geographic Insights")
         
-        # State selection
-        state_data = self.analytics.get_state_wise_analysis(50)
-        states = state_data['state'].tolist() if not state_data.empty else []
+        # State selection only needs the names; the metrics are read for the all-states view
+        states = cached_state_names(self.analytics, self.data_version)
         
-        selected_state = st.selectbox("Select State for Detailed Analysis", ['All States'] + states)
+        selected_state = st.selectbox("Select State for Detailed Analysis", ['All States', *states])
         
         if selected_state == 'All States':
             # All states analysis
+            state_data = cached_state_wise_analysis(self.analytics, self.data_version, 20)
             col1, col2 = st.columns(2)
             
             with col1:
                 st.markdown("### 🏆 Top Performing States")
                 if not state_data.empty:
-                    fig = px.choropleth(
-                        state_data.head(20),
-                        locations='state',
+                    # No India GeoJSON ships with the app, so states are compared as colored bars
+                    fig = build_chart(
+                        'bar',
+                        state_data,
+                        x='state',
+                        y='total_amount',
                         color='total_amount',
-                        hover_name='state',
-                        hover_data=['total_transactions', 'avg_amount'],
-                        title="State-wise Transaction Heatmap",
-                        color_continuous_scale='viridis'
+                        title="State-wise Transaction Amount",
+                        color_continuous_scale='viridis',
+                        tickangle=45
                     )
                     st.plotly_chart(fig, use_container_width=True)
             
             with col2:
                 st.markdown("### 📊 State Performance Metrics")
                 if not state_data.empty:
-                    fig = px.scatter(
-                        state_data.head(20),
+                    fig = build_chart(
+                        'scatter',
+                        state_data,
                         x='total_transactions',
                         y='total_amount',
                         size='avg_amount',
@@ -585,7 +765,7 @@ class PhonePeDashboard:
             st.markdown(f"### 📍 Detailed Analysis: {selected_state}")
             
             # Get comprehensive state report
-            state_report = self.analytics.get_comprehensive_state_report(selected_state)
+            state_report = cached_comprehensive_state_report(self.analytics, self.data_version, selected_state)
             
             if state_report:
                 # District performance
@@ -594,7 +774,8 @@ class PhonePeDashboard:
                 with col1:
                     if not state_report['districts'].empty:
                         st.markdown("#### Top Districts")
-                        fig = px.bar(
+                        fig = build_chart(
+                            'bar',
                             state_report['districts'].head(10),
                             x='total_amount',
                             y='district',
@@ -606,20 +787,21 @@ class PhonePeDashboard:
                 with col2:
                     if not state_report['users'].empty:
                         st.markdown("#### Device Brand Preferences")
-                        fig = px.pie(
+                        fig = build_chart(
+                            'pie',
                             state_report['users'],
                             values='total_users',
                             names='brands',
                             title=f"Brand Distribution in {selected_state}"
                         )
-                        st.plotly_chart(fig, use_container_width=True)
+                        st.plotly_chart(fig, use_container_width=True, config=STATIC_CHART_CONFIG)
     
     
     def render_insurance_insights(self):
         """Render insurance insights dashboard"""
         st.markdown("## 🛡️ Insurance Insights")
         
-        insurance_data = self.analytics.get_insurance_insights()
+        insurance_data = cached_insurance_insights(self.analytics, self.data_version)
         
         if not insurance_data.empty:
             # Key metrics
@@ -642,17 +824,19 @@ class PhonePeDashboard:
             
             with col1:
                 st.markdown("### Insurance Type Distribution")
-                fig = px.pie(
+                fig = build_chart(
+                    'pie',
                     insurance_data,
                     values='total_premium',
                     names='insurance_type',
                     title="Premium Distribution by Insurance Type"
                 )
-                st.plotly_chart(fig, use_container_width=True)
+                st.plotly_chart(fig, use_container_width=True, config=STATIC_CHART_CONFIG)
             
             with col2:
                 st.markdown("### Policy Count vs Premium")
-                fig = px.scatter(
+                fig = build_chart(
+                    'scatter',
                     insurance_data,
                     x='total_policies',
                     y='avg_premium',
@@ -665,7 +849,8 @@ class PhonePeDashboard:
             
             # Market analysis
             st.markdown("### 📊 Insurance Market Analysis")
-            fig = px.bar(
+            fig = build_chart(
+                'bar',
                 insurance_data,
                 x='insurance_type',
                 y='total_premium',
@@ -673,7 +858,7 @@ class PhonePeDashboard:
                 color='avg_premium',
                 color_continuous_scale='viridis'
             )
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(fig, use_container_width=True, config=STATIC_CHART_CONFIG)
     
     
 # Initialize and run dashboard
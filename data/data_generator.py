@@ -1,10 +1,10 @@
-import random
+import numpy as np
 import pandas as pd
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Union
 
 class PhonePeDataGenerator:
-    def __init__(self):
+    def __init__(self, seed: Optional[Union[int, np.random.SeedSequence]] = None):
         self.states = [
             'Andhra Pradesh', 'Arunachal Pradesh', 'Assam', 'Bihar', 'Chhattisgarh',
             'Goa', 'Gujarat', 'Haryana', 'Himachal Pradesh', 'Jharkhand', 'Karnataka',
@@ -32,164 +32,188 @@ class PhonePeDataGenerator:
         
         self.years = [2018, 2019, 2020, 2021, 2022, 2023, 2024]
         self.quarters = [1, 2, 3, 4]
+        
+        self.districts = {
+            'Maharashtra': ['Mumbai', 'Pune', 'Nagpur', 'Nashik', 'Aurangabad'],
+            'Karnataka': ['Bangalore', 'Mysore', 'Hubli', 'Mangalore', 'Belgaum'],
+            'Tamil Nadu': ['Chennai', 'Coimbatore', 'Madurai', 'Salem', 'Tiruchirappalli'],
+            'Gujarat': ['Ahmedabad', 'Surat', 'Vadodara', 'Rajkot', 'Bhavnagar'],
+            'Rajasthan': ['Jaipur', 'Jodhpur', 'Udaipur', 'Kota', 'Bikaner']
+        }
+        
+        # Every column is drawn in one call; PCG64 is faster than the Mersenne Twister behind random
+        self._seed_sequence = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+        self.rng = np.random.default_rng(self._seed_sequence)
+        self._states = np.array(self.states, dtype=object)
+        self._transaction_types = np.array(self.transaction_types, dtype=object)
+        self._insurance_types = np.array(self.insurance_types, dtype=object)
+        self._brands = np.array(self.brands, dtype=object)
+        self._years = np.array(self.years)
+        self._quarters = np.array(self.quarters)
+        
+        # Districts of all states in one flat array; each state's run starts at its offset
+        self._district_states = np.array(list(self.districts), dtype=object)
+        self._district_counts = np.array([len(d) for d in self.districts.values()])
+        self._district_offsets = np.concatenate(([0], np.cumsum(self._district_counts)[:-1]))
+        self._district_names = np.array([d for ds in self.districts.values() for d in ds], dtype=object)
+    
+    def spawn(self, n_children: int) -> List['PhonePeDataGenerator']:
+        """Independent child generators, one per thread; a numpy Generator must not be shared across threads"""
+        return [PhonePeDataGenerator(child) for child in self._seed_sequence.spawn(n_children)]
+    
+    def _choice(self, values: np.ndarray, size: int) -> np.ndarray:
+        """Draw size elements of values uniformly with replacement"""
+        return values[self.rng.integers(0, len(values), size)]
+    
+    def _amounts(self, low: float, high: float, size: int) -> np.ndarray:
+        """Draw size uniform amounts rounded to paise"""
+        return np.round(self.rng.uniform(low, high, size), 2)
+    
+    def _state_districts(self, size: int):
+        """Draw size (state, district) pairs, picking a state first and then one of its districts"""
+        state_idx = self.rng.integers(0, len(self._district_states), size)
+        district_idx = (self.rng.random(size) * self._district_counts[state_idx]).astype(int)
+        return self._district_states[state_idx], self._district_names[self._district_offsets[state_idx] + district_idx]
+    
+    @staticmethod
+    def _records(columns: Dict[str, np.ndarray]) -> List[Dict[str, Any]]:
+        """Turn equal-length column arrays into row dicts of plain Python values"""
+        names = list(columns)
+        return [dict(zip(names, row)) for row in zip(*(column.tolist() for column in columns.values()))]
+    
+    def generate_aggregated_transaction_columns(self, num_records: int = 1000) -> Dict[str, np.ndarray]:
+        """Generate sample aggregated transaction data as one array per column"""
+        return {
+            'state': self._choice(self._states, num_records),
+            'year': self._choice(self._years, num_records),
+            'quarter': self._choice(self._quarters, num_records),
+            'transaction_type': self._choice(self._transaction_types, num_records),
+            'transaction_count': self.rng.integers(1000, 100001, num_records),
+            'transaction_amount': self._amounts(10000, 10000000, num_records)
+        }
     
     def generate_aggregated_transaction_data(self, num_records: int = 1000) -> List[Dict[str, Any]]:
         """Generate sample aggregated transaction data"""
-        data = []
-        for _ in range(num_records):
-            record = {
-                'state': random.choice(self.states),
-                'year': random.choice(self.years),
-                'quarter': random.choice(self.quarters),
-                'transaction_type': random.choice(self.transaction_types),
-                'transaction_count': random.randint(1000, 100000),
-                'transaction_amount': round(random.uniform(10000, 10000000), 2)
-            }
-            data.append(record)
-        return data
+        return self._records(self.generate_aggregated_transaction_columns(num_records))
+    
+    def generate_aggregated_user_columns(self, num_records: int = 800) -> Dict[str, np.ndarray]:
+        """Generate sample aggregated user data as one array per column"""
+        return {
+            'state': self._choice(self._states, num_records),
+            'year': self._choice(self._years, num_records),
+            'quarter': self._choice(self._quarters, num_records),
+            'brands': self._choice(self._brands, num_records),
+            'count': self.rng.integers(100, 50001, num_records),
+            'percentage': self._amounts(1.0, 25.0, num_records)
+        }
     
     def generate_aggregated_user_data(self, num_records: int = 800) -> List[Dict[str, Any]]:
         """Generate sample aggregated user data"""
-        data = []
-        for _ in range(num_records):
-            record = {
-                'state': random.choice(self.states),
-                'year': random.choice(self.years),
-                'quarter': random.choice(self.quarters),
-                'brands': random.choice(self.brands),
-                'count': random.randint(100, 50000),
-                'percentage': round(random.uniform(1.0, 25.0), 2)
-            }
-            data.append(record)
-        return data
+        return self._records(self.generate_aggregated_user_columns(num_records))
+    
+    def generate_aggregated_insurance_columns(self, num_records: int = 600) -> Dict[str, np.ndarray]:
+        """Generate sample aggregated insurance data as one array per column"""
+        return {
+            'state': self._choice(self._states, num_records),
+            'year': self._choice(self._years, num_records),
+            'quarter': self._choice(self._quarters, num_records),
+            'insurance_type': self._choice(self._insurance_types, num_records),
+            'insurance_count': self.rng.integers(50, 10001, num_records),
+            'insurance_amount': self._amounts(5000, 5000000, num_records)
+        }
     
     def generate_aggregated_insurance_data(self, num_records: int = 600) -> List[Dict[str, Any]]:
         """Generate sample aggregated insurance data"""
-        data = []
-        for _ in range(num_records):
-            record = {
-                'state': random.choice(self.states),
-                'year': random.choice(self.years),
-                'quarter': random.choice(self.quarters),
-                'insurance_type': random.choice(self.insurance_types),
-                'insurance_count': random.randint(50, 10000),
-                'insurance_amount': round(random.uniform(5000, 5000000), 2)
-            }
-            data.append(record)
-        return data
+        return self._records(self.generate_aggregated_insurance_columns(num_records))
+    
+    def generate_map_transaction_columns(self, num_records: int = 1200) -> Dict[str, np.ndarray]:
+        """Generate sample map transaction data as one array per column"""
+        states, district_names = self._state_districts(num_records)
+        return {
+            'state': states,
+            'year': self._choice(self._years, num_records),
+            'quarter': self._choice(self._quarters, num_records),
+            'district': district_names,
+            'count': self.rng.integers(500, 50001, num_records),
+            'amount': self._amounts(25000, 2500000, num_records)
+        }
     
     def generate_map_transaction_data(self, num_records: int = 1200) -> List[Dict[str, Any]]:
         """Generate sample map transaction data"""
-        districts = {
-            'Maharashtra': ['Mumbai', 'Pune', 'Nagpur', 'Nashik', 'Aurangabad'],
-            'Karnataka': ['Bangalore', 'Mysore', 'Hubli', 'Mangalore', 'Belgaum'],
-            'Tamil Nadu': ['Chennai', 'Coimbatore', 'Madurai', 'Salem', 'Tiruchirappalli'],
-            'Gujarat': ['Ahmedabad', 'Surat', 'Vadodara', 'Rajkot', 'Bhavnagar'],
-            'Rajasthan': ['Jaipur', 'Jodhpur', 'Udaipur', 'Kota', 'Bikaner']
+        return self._records(self.generate_map_transaction_columns(num_records))
+    
+    def generate_map_user_columns(self, num_records: int = 1000) -> Dict[str, np.ndarray]:
+        """Generate sample map user data as one array per column"""
+        states, district_names = self._state_districts(num_records)
+        return {
+            'state': states,
+            'year': self._choice(self._years, num_records),
+            'quarter': self._choice(self._quarters, num_records),
+            'district': district_names,
+            'registered_users': self.rng.integers(1000, 100001, num_records),
+            'app_opens': self.rng.integers(5000, 500001, num_records)
         }
-        
-        data = []
-        for _ in range(num_records):
-            state = random.choice(list(districts.keys()))
-            record = {
-                'state': state,
-                'year': random.choice(self.years),
-                'quarter': random.choice(self.quarters),
-                'district': random.choice(districts[state]),
-                'count': random.randint(500, 50000),
-                'amount': round(random.uniform(25000, 2500000), 2)
-            }
-            data.append(record)
-        return data
     
     def generate_map_user_data(self, num_records: int = 1000) -> List[Dict[str, Any]]:
         """Generate sample map user data"""
-        districts = {
-            'Maharashtra': ['Mumbai', 'Pune', 'Nagpur', 'Nashik', 'Aurangabad'],
-            'Karnataka': ['Bangalore', 'Mysore', 'Hubli', 'Mangalore', 'Belgaum'],
-            'Tamil Nadu': ['Chennai', 'Coimbatore', 'Madurai', 'Salem', 'Tiruchirappalli'],
-            'Gujarat': ['Ahmedabad', 'Surat', 'Vadodara', 'Rajkot', 'Bhavnagar'],
-            'Rajasthan': ['Jaipur', 'Jodhpur', 'Udaipur', 'Kota', 'Bikaner']
+        return self._records(self.generate_map_user_columns(num_records))
+    
+    def generate_map_insurance_columns(self, num_records: int = 800) -> Dict[str, np.ndarray]:
+        """Generate sample map insurance data as one array per column"""
+        states, district_names = self._state_districts(num_records)
+        return {
+            'state': states,
+            'year': self._choice(self._years, num_records),
+            'quarter': self._choice(self._quarters, num_records),
+            'district': district_names,
+            'insurance_count': self.rng.integers(100, 5001, num_records),
+            'insurance_amount': self._amounts(10000, 1000000, num_records)
         }
-        
-        data = []
-        for _ in range(num_records):
-            state = random.choice(list(districts.keys()))
-            record = {
-                'state': state,
-                'year': random.choice(self.years),
-                'quarter': random.choice(self.quarters),
-                'district': random.choice(districts[state]),
-                'registered_users': random.randint(1000, 100000),
-                'app_opens': random.randint(5000, 500000)
-            }
-            data.append(record)
-        return data
     
     def generate_map_insurance_data(self, num_records: int = 800) -> List[Dict[str, Any]]:
         """Generate sample map insurance data"""
-        districts = {
-            'Maharashtra': ['Mumbai', 'Pune', 'Nagpur', 'Nashik', 'Aurangabad'],
-            'Karnataka': ['Bangalore', 'Mysore', 'Hubli', 'Mangalore', 'Belgaum'],
-            'Tamil Nadu': ['Chennai', 'Coimbatore', 'Madurai', 'Salem', 'Tiruchirappalli'],
-            'Gujarat': ['Ahmedabad', 'Surat', 'Vadodara', 'Rajkot', 'Bhavnagar'],
-            'Rajasthan': ['Jaipur', 'Jodhpur', 'Udaipur', 'Kota', 'Bikaner']
+        return self._records(self.generate_map_insurance_columns(num_records))
+    
+    def generate_top_transaction_columns(self, num_records: int = 1000) -> Dict[str, np.ndarray]:
+        """Generate sample top transaction data as one array per column"""
+        return {
+            'state': self._choice(self._states, num_records),
+            'year': self._choice(self._years, num_records),
+            'quarter': self._choice(self._quarters, num_records),
+            'pincode': self.rng.integers(100000, 1000000, num_records),
+            'transaction_count': self.rng.integers(100, 10001, num_records),
+            'transaction_amount': self._amounts(5000, 500000, num_records)
         }
-        
-        data = []
-        for _ in range(num_records):
-            state = random.choice(list(districts.keys()))
-            record = {
-                'state': state,
-                'year': random.choice(self.years),
-                'quarter': random.choice(self.quarters),
-                'district': random.choice(districts[state]),
-                'insurance_count': random.randint(100, 5000),
-                'insurance_amount': round(random.uniform(10000, 1000000), 2)
-            }
-            data.append(record)
-        return data
     
     def generate_top_transaction_data(self, num_records: int = 1000) -> List[Dict[str, Any]]:
         """Generate sample top transaction data"""
-        data = []
-        for _ in range(num_records):
-            record = {
-                'state': random.choice(self.states),
-                'year': random.choice(self.years),
-                'quarter': random.choice(self.quarters),
-                'pincode': str(random.randint(100000, 999999)),
-                'transaction_count': random.randint(100, 10000),
-                'transaction_amount': round(random.uniform(5000, 500000), 2)
-            }
-            data.append(record)
-        return data
+        return self._records(self.generate_top_transaction_columns(num_records))
+    
+    def generate_top_user_columns(self, num_records: int = 800) -> Dict[str, np.ndarray]:
+        """Generate sample top user data as one array per column"""
+        return {
+            'state': self._choice(self._states, num_records),
+            'year': self._choice(self._years, num_records),
+            'quarter': self._choice(self._quarters, num_records),
+            'pincode': self.rng.integers(100000, 1000000, num_records),
+            'registered_users': self.rng.integers(500, 25001, num_records)
+        }
     
     def generate_top_user_data(self, num_records: int = 800) -> List[Dict[str, Any]]:
         """Generate sample top user data"""
-        data = []
-        for _ in range(num_records):
-            record = {
-                'state': random.choice(self.states),
-                'year': random.choice(self.years),
-                'quarter': random.choice(self.quarters),
-                'pincode': str(random.randint(100000, 999999)),
-                'registered_users': random.randint(500, 25000)
-            }
-            data.append(record)
-        return data
+        return self._records(self.generate_top_user_columns(num_records))
+    
+    def generate_top_insurance_columns(self, num_records: int = 600) -> Dict[str, np.ndarray]:
+        """Generate sample top insurance data as one array per column"""
+        return {
+            'state': self._choice(self._states, num_records),
+            'year': self._choice(self._years, num_records),
+            'quarter': self._choice(self._quarters, num_records),
+            'pincode': self.rng.integers(100000, 1000000, num_records),
+            'insurance_count': self.rng.integers(50, 2001, num_records),
+            'insurance_amount': self._amounts(2500, 250000, num_records)
+        }
     
     def generate_top_insurance_data(self, num_records: int = 600) -> List[Dict[str, Any]]:
         """Generate sample top insurance data"""
-        data = []
-        for _ in range(num_records):
-            record = {
-                'state': random.choice(self.states),
-                'year': random.choice(self.years),
-                'quarter': random.choice(self.quarters),
-                'pincode': str(random.randint(100000, 999999)),
-                'insurance_count': random.randint(50, 2000),
-                'insurance_amount': round(random.uniform(2500, 250000), 2)
-            }
-            data.append(record)
-        return data
+        return self._records(self.generate_top_insurance_columns(num_records))
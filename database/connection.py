@@ -0,0 +1,28 @@
+import atexit
+import os
+import sqlite3
+import threading
+from typing import Dict
+from database.schema import DatabaseManager
+
+# One connection per database file, shared by setup and analytics so the page cache stays warm
+_connections: Dict[str, sqlite3.Connection] = {}
+_lock = threading.Lock()
+
+def get_connection(db_path: str = "phonepe_insights.db") -> sqlite3.Connection:
+    """Return the process-wide connection to db_path, opening it on first use"""
+    key = os.path.abspath(db_path)
+    with _lock:
+        connection = _connections.get(key)
+        if connection is None:
+            connection = DatabaseManager(db_path).connect()
+            _connections[key] = connection
+        return connection
+
+@atexit.register
+def close_connections():
+    """Close every shared connection"""
+    with _lock:
+        for connection in _connections.values():
+            connection.close()
+        _connections.clear()
@@ -1,63 +1,310 @@
 import sqlite3
+import time
 import pandas as pd
-from typing import List, Dict, Any, Optional
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from itertools import repeat
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple, Iterator, Union
 from database.schema import DatabaseManager
 
 class DatabaseOperations(DatabaseManager):
-    def __init__(self, db_path: str = "phonepe_insights.db"):
-        super().__init__(db_path)
+    # Tuning for read-heavy analytics: WAL, 1 GB mmap, 256 MB page cache, in-memory temp B-trees
+    CONNECTION_PRAGMAS = [
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA mmap_size=1073741824",
+        "PRAGMA cache_size=-262144",
+        "PRAGMA temp_store=MEMORY"
+    ]
+    
+    # Subset that also applies to the short-lived read-only connections used for parallel scans
+    READ_ONLY_PRAGMAS = [
+        "PRAGMA mmap_size=1073741824",
+        "PRAGMA temp_store=MEMORY"
+    ]
+    
+    # Default batch size for fetchmany() on cursors created here
+    FETCH_ARRAYSIZE = 2048
+    
+    # Low-cardinality text columns returned as pandas categoricals
+    CATEGORICAL_COLUMNS = frozenset({'state', 'transaction_type', 'insurance_type', 'brands'})
+    
+    # Table names are interpolated into SQL, so the helpers below accept only these
+    ALLOWED_TABLES = frozenset({
+        'aggregated_transaction', 'aggregated_user', 'aggregated_insurance',
+        'map_transaction', 'map_user', 'map_insurance',
+        'top_transaction', 'top_user', 'top_insurance',
+        *DatabaseManager.MATERIALIZED_VIEWS
+    })
+    
+    # Per-table statements, built once for every allowed table
+    TABLE_STATEMENTS = {
+        'info': "PRAGMA table_info({})",
+        'count': "SELECT COUNT(*) FROM {}",
+        'clear': "DELETE FROM {}",
+        'drop': "DROP TABLE IF EXISTS {}"
+    }
+
+    def __init__(self, db_path: str = "phonepe_insights.db", connection: Optional[sqlite3.Connection] = None):
+        super().__init__(db_path, connection)
+        self._insert_sql: Dict[Tuple[str, Tuple[str, ...]], str] = {}
+        self._stamped_tables: Dict[str, bool] = {}
+        self._table_sql: Dict[Tuple[str, str], str] = {
+            (kind, table): template.format(table)
+            for kind, template in self.TABLE_STATEMENTS.items()
+            for table in self.ALLOWED_TABLES
+        }
+        self._bulk_loading = False
+        self._stale_views: set = set()
+
+    def connect(self) -> sqlite3.Connection:
+        """Establish a tuned database connection"""
+        connection = super().connect()
+        for pragma in self.CONNECTION_PRAGMAS:
+            connection.execute(pragma)
+        return connection
+
+    def _cursor(self) -> sqlite3.Cursor:
+        """New cursor for a query; compiled statements are reused by the connection's own cache"""
+        cursor = self.connection.cursor()
+        # Plain tuples are all DataFrame construction needs, even inside as_rows()
+        cursor.row_factory = None
+        cursor.arraysize = self.FETCH_ARRAYSIZE
+        return cursor
         
-    def insert_bulk_data(self, table_name: str, data: List[Dict[str, Any]]) -> bool:
+    def _is_allowed_table(self, table_name: str) -> bool:
+        """Check a table name against the whitelist before it reaches any SQL"""
+        if table_name in self.ALLOWED_TABLES:
+            return True
+        print(f"❌ Unknown table: {table_name}")
+        return False
+    
+    def _insert_statement(self, table_name: str, columns: Tuple[str, ...]) -> str:
+        """INSERT statement for a table and column order, built once and reused"""
+        key = (table_name, columns)
+        query = self._insert_sql.get(key)
+        if query is None:
+            placeholders = ', '.join(['?' for _ in columns])
+            query = f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES ({placeholders})"
+            self._insert_sql[key] = query
+        return query
+    
+    def _needs_created_at(self, table_name: str, columns: Tuple[str, ...]) -> bool:
+        """True when the table has a created_at column the caller did not supply"""
+        if 'created_at' in columns:
+            return False
+        if table_name not in self._stamped_tables:
+            schema = self.connection.execute(self._table_sql[('info', table_name)]).fetchall()
+            self._stamped_tables[table_name] = any(column[1] == 'created_at' for column in schema)
+        return self._stamped_tables[table_name]
+    
+    @staticmethod
+    def _load_timestamp() -> int:
+        """Current time as unix-epoch seconds, matching the created_at column default"""
+        return int(time.time())
+    
+    def insert_bulk_data(self, table_name: str, data: List[Dict[str, Any]], verbose: bool = False) -> bool:
         """Insert bulk data into specified table"""
-        if not data:
+        if not data or not self._is_allowed_table(table_name):
             return False
             
         try:
             cursor = self.connection.cursor()
             
             # Get column names from first record
-            columns = list(data[0].keys())
-            placeholders = ', '.join(['?' for _ in columns])
-            columns_str = ', '.join(columns)
+            keys = tuple(data[0].keys())
+            rows = (tuple(record[key] for key in keys) for record in data)
+            columns = keys
             
-            query = f"INSERT INTO {table_name} ({columns_str}) VALUES ({placeholders})"
+            # One timestamp for the whole batch instead of evaluating the column DEFAULT per row
+            if self._needs_created_at(table_name, keys):
+                created_at = (self._load_timestamp(),)
+                rows = (row + created_at for row in rows)
+                columns = keys + ('created_at',)
+            query = self._insert_statement(table_name, columns)
             
-            # Convert data to tuples
-            values = [tuple(record[col] for col in columns) for record in data]
+            # Stream tuples into one transaction instead of building the whole list first
+            with self._transaction():
+                cursor.executemany(query, rows)
+                self._refresh_views_after_write(table_name)
             
-            cursor.executemany(query, values)
-            self.connection.commit()
+            if verbose:
+                print(f"✅ Inserted {len(data)} records into {table_name}")
+            return True
             
-            print(f"✅ Inserted {len(data)} records into {table_name}")
+        except sqlite3.Error as e:
+            print(f"❌ Error inserting bulk data into {table_name}: {e}")
+            return False
+    
+    def insert_bulk_columns(self, table_name: str, columns: Dict[str, Any], verbose: bool = False) -> bool:
+        """Insert column-oriented data (one equal-length sequence per column) into specified table"""
+        if not columns or not self._is_allowed_table(table_name):
+            return False
+        
+        try:
+            names = tuple(columns.keys())
+            
+            # tolist() turns numpy scalars into Python values sqlite3 can bind
+            values = [column.tolist() if hasattr(column, 'tolist') else column for column in columns.values()]
+            
+            # One timestamp for the whole batch instead of evaluating the column DEFAULT per row
+            if self._needs_created_at(table_name, names):
+                values.append(repeat(self._load_timestamp()))
+                names += ('created_at',)
+            query = self._insert_statement(table_name, names)
+            with self._transaction():
+                cursor = self.connection.executemany(query, zip(*values))
+                self._refresh_views_after_write(table_name)
+            
+            if verbose:
+                print(f"✅ Inserted {cursor.rowcount} records into {table_name}")
             return True
             
         except sqlite3.Error as e:
             print(f"❌ Error inserting bulk data into {table_name}: {e}")
             return False
     
-    def execute_query(self, query: str, params: Optional[tuple] = None) -> pd.DataFrame:
-        """Execute SQL query and return results as DataFrame"""
+    def insert_dataframe(self, table_name: str, df: pd.DataFrame, verbose: bool = False) -> bool:
+        """Insert all rows of a DataFrame into specified table"""
+        if df.empty:
+            return False
+        
+        # Reuse the column-wise path: executemany beats to_sql here and respects bulk_load()
+        return self.insert_bulk_columns(table_name, {column: df[column].to_numpy() for column in df.columns}, verbose)
+    
+    def _refresh_views_after_write(self, table_name: str):
+        """Rebuild, in the writing transaction, only the roll-up tables that summarize table_name"""
+        view_names = self.views_reading(table_name)
+        if not view_names:
+            return
+        if self._bulk_loading:
+            # Rebuilt once, just before the bulk load commits
+            self._stale_views.update(view_names)
+        else:
+            self._rebuild_materialized_views(view_names)
+    
+    @contextmanager
+    def _transaction(self):
+        """Commit on success and roll back on error, unless a bulk load owns the transaction"""
+        if self._bulk_loading:
+            yield
+        else:
+            with self.connection:
+                yield
+    
+    @contextmanager
+    def bulk_load(self):
+        """Run every insert inside the block as one transaction, without fsyncs"""
+        # Under WAL this cannot corrupt the file; a power cut only loses the newest commits
+        self.connection.execute("PRAGMA synchronous=OFF")
+        self._bulk_loading = True
+        try:
+            with self.connection:
+                yield self
+                # The roll-ups commit together with the rows they summarize
+                if self._stale_views:
+                    self._rebuild_materialized_views(self._stale_views)
+        finally:
+            self._bulk_loading = False
+            self._stale_views.clear()
+            self.connection.execute("PRAGMA synchronous=NORMAL")
+    
+    def execute_query(self, query: str, params: Optional[tuple] = None,
+                      chunksize: Optional[int] = None) -> Union[pd.DataFrame, Iterator[pd.DataFrame]]:
+        """Execute SQL query and return results as DataFrame (or an iterator of chunks)"""
+        if chunksize:
+            return self._iter_query_chunks(query, params, chunksize)
+        
         try:
-            if params:
-                df = pd.read_sql_query(query, self.connection, params=params)
-            else:
-                df = pd.read_sql_query(query, self.connection)
-            return df
+            cursor = self._cursor()
+            try:
+                cursor.execute(query, params or ())
+                
+                if cursor.description is None:
+                    return pd.DataFrame()
+                
+                return self._rows_to_frame(cursor, cursor.fetchall())
+            finally:
+                cursor.close()
         except sqlite3.Error as e:
             print(f"❌ Error executing query: {e}")
             return pd.DataFrame()
     
+    @classmethod
+    def _rows_to_frame(cls, cursor: sqlite3.Cursor, rows: List[tuple]) -> pd.DataFrame:
+        """Build a DataFrame from fetched tuple rows"""
+        columns = [column[0] for column in cursor.description]
+        df = pd.DataFrame.from_records(rows, columns=columns)
+        for column in cls.CATEGORICAL_COLUMNS.intersection(df.columns):
+            df[column] = df[column].astype('category')
+        return df
+    
+    def _iter_query_chunks(self, query: str, params: Optional[tuple], chunksize: int) -> Iterator[pd.DataFrame]:
+        """Yield query results as DataFrames of at most chunksize rows"""
+        # A dedicated cursor, so other queries can run while the caller iterates
+        cursor = self._cursor()
+        try:
+            cursor.execute(query, params or ())
+            while True:
+                rows = cursor.fetchmany(chunksize)
+                if not rows:
+                    break
+                yield self._rows_to_frame(cursor, rows)
+        except sqlite3.Error as e:
+            print(f"❌ Error executing query: {e}")
+        finally:
+            cursor.close()
+    
+    def execute_queries_parallel(self, queries: Dict[str, Tuple[str, Optional[tuple]]],
+                                 max_workers: int = 5) -> Dict[str, pd.DataFrame]:
+        """Run independent read-only queries concurrently, one connection per query"""
+        if not queries:
+            return {}
+        
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(queries))) as executor:
+            futures = {
+                name: executor.submit(self._execute_read_only, query, params)
+                for name, (query, params) in queries.items()
+            }
+            return {name: future.result() for name, future in futures.items()}
+    
+    def _execute_read_only(self, query: str, params: Optional[tuple] = None) -> pd.DataFrame:
+        """Execute SQL query on a short-lived read-only connection"""
+        try:
+            uri = f"{Path(self.db_path).resolve().as_uri()}?mode=ro"
+            connection = sqlite3.connect(uri, uri=True)
+            try:
+                for pragma in self.READ_ONLY_PRAGMAS:
+                    connection.execute(pragma)
+                cursor = connection.execute(query, params or ())
+                return self._rows_to_frame(cursor, cursor.fetchall())
+            finally:
+                connection.close()
+        except sqlite3.Error as e:
+            print(f"❌ Error executing query: {e}")
+            return pd.DataFrame()
+    
+    def get_data_version(self) -> Tuple[int, int]:
+        """Version that changes whenever this or any other connection writes to the database"""
+        # PRAGMA data_version only moves for other connections' commits; total_changes covers this one
+        data_version = self.connection.execute("PRAGMA data_version").fetchone()[0]
+        return data_version, self.connection.total_changes
+    
     def get_table_info(self, table_name: str) -> Dict[str, Any]:
         """Get information about table structure and row count"""
+        if not self._is_allowed_table(table_name):
+            return {}
+        
         try:
             cursor = self.connection.cursor()
             
             # Get table schema
-            cursor.execute(f"PRAGMA table_info({table_name})")
+            cursor.execute(self._table_sql[('info', table_name)])
             schema = cursor.fetchall()
             
             # Get row count
-            cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
+            cursor.execute(self._table_sql[('count', table_name)])
             row_count = cursor.fetchone()[0]
             
             return {
@@ -71,10 +318,13 @@ class DatabaseOperations(DatabaseManager):
     
     def clear_table(self, table_name: str) -> bool:
         """Clear all data from specified table"""
+        if not self._is_allowed_table(table_name):
+            return False
+        
         try:
-            cursor = self.connection.cursor()
-            cursor.execute(f"DELETE FROM {table_name}")
-            self.connection.commit()
+            with self._transaction():
+                self.connection.execute(self._table_sql[('clear', table_name)])
+                self._refresh_views_after_write(table_name)
             print(f"✅ Cleared all data from {table_name}")
             return True
         except sqlite3.Error as e:
@@ -83,9 +333,12 @@ class DatabaseOperations(DatabaseManager):
 
     def drop_table(self, table_name: str) -> bool:
         """Drop specified table"""
+        if not self._is_allowed_table(table_name):
+            return False
+        
         try:
             cursor = self.connection.cursor()
-            cursor.execute(f"DROP TABLE IF EXISTS {table_name}")
+            cursor.execute(self._table_sql[('drop', table_name)])
             self.connection.commit()
             print(f"✅ Dropped table {table_name}")
             return True
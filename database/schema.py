@@ -1,194 +1,408 @@
 import sqlite3
 import os
-from typing import Optional
+from contextlib import contextmanager
+from typing import Iterable, List, Optional
 
 class DatabaseManager:
-    def __init__(self, db_path: str = "phonepe_insights.db"):
-        """Initialize database manager with SQLite connection"""
+    # Narrower indexes replaced by the covering ones in INDEXES
+    SUPERSEDED_INDEXES = [
+        "idx_state_year_quarter",
+        "idx_state_district",
+        "idx_state_district_user",
+        "idx_state_pincode"
+    ]
+    
+    # Indexes used by the analytics queries, by name
+    INDEXES = {
+        # Covering indexes for state-filtered reports grouped by district/pincode
+        "idx_agg_tx_state_year_quarter": "aggregated_transaction(state, year, quarter, transaction_type)",
+        "idx_map_tx_state_dist": "map_transaction(state, district, year, quarter, count, amount)",
+        "idx_map_user_state_dist": "map_user(state, district, year, quarter, registered_users, app_opens)",
+        "idx_top_tx_state_pincode": "top_transaction(state, pincode, year, quarter, transaction_count, transaction_amount)",
+        "idx_transaction_type": "aggregated_transaction(transaction_type)",
+        "idx_state_year_quarter_user": "aggregated_user(state, year, quarter)",
+        "idx_brands": "aggregated_user(brands)",
+        "idx_state_year_quarter_insurance": "aggregated_insurance(state, year, quarter)",
+        "idx_insurance_type": "aggregated_insurance(insurance_type)",
+        "idx_year_quarter_map": "map_transaction(year, quarter)",
+        "idx_year_quarter_map_user": "map_user(year, quarter)",
+        "idx_state_district_insurance": "map_insurance(state, district)",
+        "idx_year_quarter_map_insurance": "map_insurance(year, quarter)",
+        "idx_year_quarter_top": "top_transaction(year, quarter)",
+        "idx_state_pincode_user": "top_user(state, pincode)",
+        "idx_year_quarter_top_user": "top_user(year, quarter)",
+        "idx_state_pincode_insurance": "top_insurance(state, pincode)",
+        "idx_year_quarter_top_insurance": "top_insurance(year, quarter)"
+    }
+    
+    # Table each roll-up below summarizes; a write to it makes only those roll-ups stale
+    MATERIALIZED_VIEW_SOURCES = {
+        'mv_overview': 'aggregated_transaction',
+        'mv_state_totals': 'aggregated_transaction',
+        'mv_type_totals': 'aggregated_transaction',
+        'mv_year_quarter_totals': 'aggregated_transaction',
+        'mv_quarter_totals': 'aggregated_transaction',
+        'mv_brand_totals': 'aggregated_user',
+        'mv_insurance_type_totals': 'aggregated_insurance'
+    }
+    
+    # Indexes on the roll-up columns the analytics queries sort by
+    MATERIALIZED_VIEW_INDEXES = [
+        "CREATE INDEX IF NOT EXISTS idx_mv_state_totals_amount ON mv_state_totals(total_amount)",
+        "CREATE INDEX IF NOT EXISTS idx_mv_type_totals_amount ON mv_type_totals(total_amount)",
+        "CREATE INDEX IF NOT EXISTS idx_mv_year_quarter_totals ON mv_year_quarter_totals(year, quarter)",
+        "CREATE INDEX IF NOT EXISTS idx_mv_quarter_totals ON mv_quarter_totals(quarter)",
+        "CREATE INDEX IF NOT EXISTS idx_mv_brand_totals_users ON mv_brand_totals(total_users)",
+        "CREATE INDEX IF NOT EXISTS idx_mv_insurance_type_totals_premium ON mv_insurance_type_totals(total_premium)"
+    ]
+    
+    # Roll-up tables derived from the aggregated_* tables, rebuilt whenever those change
+    MATERIALIZED_VIEWS = {
+        'mv_overview': """
+            SELECT 
+                COUNT(*) as total_transactions,
+                SUM(transaction_count) as total_transaction_count,
+                SUM(transaction_amount) as total_transaction_amount,
+                AVG(transaction_amount) as avg_transaction_amount,
+                COUNT(DISTINCT state) as unique_states,
+                COUNT(DISTINCT transaction_type) as unique_transaction_types,
+                MIN(year) as earliest_year,
+                MAX(year) as latest_year
+            FROM aggregated_transaction
+        """,
+        'mv_state_totals': """
+            SELECT 
+                state,
+                SUM(transaction_count) as total_transactions,
+                SUM(transaction_amount) as total_amount,
+                AVG(transaction_amount) as avg_amount,
+                COUNT(*) as record_count,
+                COUNT(DISTINCT year) as years_active,
+                COUNT(DISTINCT transaction_type) as transaction_types
+            FROM aggregated_transaction
+            GROUP BY state
+        """,
+        'mv_type_totals': """
+            SELECT 
+                transaction_type,
+                SUM(transaction_count) as total_transactions,
+                SUM(transaction_amount) as total_amount,
+                AVG(transaction_amount) as avg_amount,
+                MIN(transaction_amount) as min_amount,
+                MAX(transaction_amount) as max_amount,
+                COUNT(DISTINCT state) as states_covered,
+                COUNT(DISTINCT year) as years_active
+            FROM aggregated_transaction
+            GROUP BY transaction_type
+        """,
+        'mv_year_quarter_totals': """
+            SELECT 
+                year,
+                quarter,
+                SUM(transaction_count) as total_transactions,
+                SUM(transaction_amount) as total_amount,
+                AVG(transaction_amount) as avg_amount,
+                COUNT(DISTINCT state) as states_active,
+                COUNT(DISTINCT transaction_type) as types_active
+            FROM aggregated_transaction
+            GROUP BY year, quarter
+        """,
+        'mv_quarter_totals': """
+            SELECT 
+                quarter,
+                AVG(transaction_count) as avg_transactions,
+                AVG(transaction_amount) as avg_amount,
+                MIN(transaction_amount) as min_amount,
+                MAX(transaction_amount) as max_amount,
+                COUNT(DISTINCT state) as states_active,
+                COUNT(DISTINCT year) as years_analyzed
+            FROM aggregated_transaction
+            GROUP BY quarter
+        """,
+        'mv_brand_totals': """
+            SELECT 
+                brands,
+                SUM(count) as total_users,
+                AVG(percentage) as avg_market_share,
+                MIN(percentage) as min_market_share,
+                MAX(percentage) as max_market_share,
+                COUNT(DISTINCT state) as states_present,
+                COUNT(DISTINCT year) as years_active
+            FROM aggregated_user
+            GROUP BY brands
+        """,
+        'mv_insurance_type_totals': """
+            SELECT 
+                insurance_type,
+                SUM(insurance_count) as total_policies,
+                SUM(insurance_amount) as total_premium,
+                AVG(insurance_amount) as avg_premium,
+                MIN(insurance_amount) as min_premium,
+                MAX(insurance_amount) as max_premium,
+                COUNT(DISTINCT state) as states_covered,
+                COUNT(DISTINCT year) as years_active
+            FROM aggregated_insurance
+            GROUP BY insurance_type
+        """
+    }
+    
+    def __init__(self, db_path: str = "phonepe_insights.db", connection: Optional[sqlite3.Connection] = None):
+        """Initialize database manager, optionally on an existing shared connection"""
         self.db_path = db_path
-        self.connection = None
+        self.connection = connection
+        # A shared connection belongs to its creator, so connect() reuses it and close() leaves it open
+        self._shared_connection = connection is not None
         
     def connect(self) -> sqlite3.Connection:
         """Establish database connection"""
+        if self._shared_connection:
+            return self.connection
+        
         try:
-            self.connection = sqlite3.connect(self.db_path, check_same_thread=False)
-            self.connection.row_factory = sqlite3.Row
+            self.connection = sqlite3.connect(self.db_path, check_same_thread=False, cached_statements=256)
             return self.connection
         except sqlite3.Error as e:
             print(f"Database connection error: {e}")
             raise
     
+    @contextmanager
+    def as_rows(self):
+        """Temporarily fetch sqlite3.Row mappings instead of plain tuples"""
+        previous = self.connection.row_factory
+        self.connection.row_factory = sqlite3.Row
+        try:
+            yield self.connection
+        finally:
+            self.connection.row_factory = previous
+    
     def close(self):
         """Close database connection"""
-        if self.connection:
+        if self.connection and not self._shared_connection:
             self.connection.close()
     
-    def create_tables(self):
-        """Create all required tables for PhonePe analytics"""
+    @staticmethod
+    def _script(queries) -> str:
+        """Join statements into one script that runs inside a single transaction"""
+        return "BEGIN;\n" + ";\n".join(queries) + ";\nCOMMIT;"
+    
+    def create_tables(self, with_indexes: bool = True):
+        """Create all required tables for PhonePe analytics; bulk loads pass with_indexes=False and index afterwards"""
         
         create_table_queries = [
             # Aggregated Transaction Table
             """
             CREATE TABLE IF NOT EXISTS aggregated_transaction (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                id INTEGER PRIMARY KEY,
                 state VARCHAR(100) NOT NULL,
                 year INTEGER NOT NULL,
                 quarter INTEGER NOT NULL,
                 transaction_type VARCHAR(50) NOT NULL,
                 transaction_count INTEGER NOT NULL DEFAULT 0,
                 transaction_amount DECIMAL(15,2) NOT NULL DEFAULT 0.00,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                created_at INTEGER NOT NULL DEFAULT (CAST(strftime('%s', 'now') AS INTEGER))
             )
             """,
             
             # Aggregated User Table
             """
             CREATE TABLE IF NOT EXISTS aggregated_user (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                id INTEGER PRIMARY KEY,
                 state VARCHAR(100) NOT NULL,
                 year INTEGER NOT NULL,
                 quarter INTEGER NOT NULL,
                 brands VARCHAR(100) NOT NULL,
                 count INTEGER NOT NULL DEFAULT 0,
                 percentage DECIMAL(5,2) NOT NULL DEFAULT 0.00,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                created_at INTEGER NOT NULL DEFAULT (CAST(strftime('%s', 'now') AS INTEGER))
             )
             """,
             
             # Aggregated Insurance Table
             """
             CREATE TABLE IF NOT EXISTS aggregated_insurance (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                id INTEGER PRIMARY KEY,
                 state VARCHAR(100) NOT NULL,
                 year INTEGER NOT NULL,
                 quarter INTEGER NOT NULL,
                 insurance_type VARCHAR(50) NOT NULL,
                 insurance_count INTEGER NOT NULL DEFAULT 0,
                 insurance_amount DECIMAL(15,2) NOT NULL DEFAULT 0.00,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                created_at INTEGER NOT NULL DEFAULT (CAST(strftime('%s', 'now') AS INTEGER))
             )
             """,
             
             # Map Transaction Table
             """
             CREATE TABLE IF NOT EXISTS map_transaction (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                id INTEGER PRIMARY KEY,
                 state VARCHAR(100) NOT NULL,
                 year INTEGER NOT NULL,
                 quarter INTEGER NOT NULL,
                 district VARCHAR(100) NOT NULL,
                 count INTEGER NOT NULL DEFAULT 0,
                 amount DECIMAL(15,2) NOT NULL DEFAULT 0.00,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                created_at INTEGER NOT NULL DEFAULT (CAST(strftime('%s', 'now') AS INTEGER))
             )
             """,
             
             # Map User Table
             """
             CREATE TABLE IF NOT EXISTS map_user (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                id INTEGER PRIMARY KEY,
                 state VARCHAR(100) NOT NULL,
                 year INTEGER NOT NULL,
                 quarter INTEGER NOT NULL,
                 district VARCHAR(100) NOT NULL,
                 registered_users INTEGER NOT NULL DEFAULT 0,
                 app_opens INTEGER NOT NULL DEFAULT 0,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                created_at INTEGER NOT NULL DEFAULT (CAST(strftime('%s', 'now') AS INTEGER))
             )
             """,
             
             # Map Insurance Table
             """
             CREATE TABLE IF NOT EXISTS map_insurance (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                id INTEGER PRIMARY KEY,
                 state VARCHAR(100) NOT NULL,
                 year INTEGER NOT NULL,
                 quarter INTEGER NOT NULL,
                 district VARCHAR(100) NOT NULL,
                 insurance_count INTEGER NOT NULL DEFAULT 0,
                 insurance_amount DECIMAL(15,2) NOT NULL DEFAULT 0.00,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                created_at INTEGER NOT NULL DEFAULT (CAST(strftime('%s', 'now') AS INTEGER))
             )
             """,
             
             # Top Transaction Table
             """
             CREATE TABLE IF NOT EXISTS top_transaction (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                id INTEGER PRIMARY KEY,
                 state VARCHAR(100) NOT NULL,
                 year INTEGER NOT NULL,
                 quarter INTEGER NOT NULL,
-                pincode VARCHAR(10) NOT NULL,
+                pincode INTEGER NOT NULL,
                 transaction_count INTEGER NOT NULL DEFAULT 0,
                 transaction_amount DECIMAL(15,2) NOT NULL DEFAULT 0.00,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                created_at INTEGER NOT NULL DEFAULT (CAST(strftime('%s', 'now') AS INTEGER))
             )
             """,
             
             # Top User Table
             """
             CREATE TABLE IF NOT EXISTS top_user (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                id INTEGER PRIMARY KEY,
                 state VARCHAR(100) NOT NULL,
                 year INTEGER NOT NULL,
                 quarter INTEGER NOT NULL,
-                pincode VARCHAR(10) NOT NULL,
+                pincode INTEGER NOT NULL,
                 registered_users INTEGER NOT NULL DEFAULT 0,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                created_at INTEGER NOT NULL DEFAULT (CAST(strftime('%s', 'now') AS INTEGER))
             )
             """,
             
             # Top Insurance Table
             """
             CREATE TABLE IF NOT EXISTS top_insurance (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                id INTEGER PRIMARY KEY,
                 state VARCHAR(100) NOT NULL,
                 year INTEGER NOT NULL,
                 quarter INTEGER NOT NULL,
-                pincode VARCHAR(10) NOT NULL,
+                pincode INTEGER NOT NULL,
                 insurance_count INTEGER NOT NULL DEFAULT 0,
                 insurance_amount DECIMAL(15,2) NOT NULL DEFAULT 0.00,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                created_at INTEGER NOT NULL DEFAULT (CAST(strftime('%s', 'now') AS INTEGER))
             )
             """
         ]
         
-        # Create indexes separately (SQLite compatible way)
-        create_index_queries = [
-            "CREATE INDEX IF NOT EXISTS idx_state_year_quarter ON aggregated_transaction(state, year, quarter)",
-            "CREATE INDEX IF NOT EXISTS idx_transaction_type ON aggregated_transaction(transaction_type)",
-            "CREATE INDEX IF NOT EXISTS idx_state_year_quarter_user ON aggregated_user(state, year, quarter)",
-            "CREATE INDEX IF NOT EXISTS idx_brands ON aggregated_user(brands)",
-            "CREATE INDEX IF NOT EXISTS idx_state_year_quarter_insurance ON aggregated_insurance(state, year, quarter)",
-            "CREATE INDEX IF NOT EXISTS idx_insurance_type ON aggregated_insurance(insurance_type)",
-            "CREATE INDEX IF NOT EXISTS idx_state_district ON map_transaction(state, district)",
-            "CREATE INDEX IF NOT EXISTS idx_year_quarter_map ON map_transaction(year, quarter)",
-            "CREATE INDEX IF NOT EXISTS idx_state_district_user ON map_user(state, district)",
-            "CREATE INDEX IF NOT EXISTS idx_year_quarter_map_user ON map_user(year, quarter)",
-            "CREATE INDEX IF NOT EXISTS idx_state_district_insurance ON map_insurance(state, district)",
-            "CREATE INDEX IF NOT EXISTS idx_year_quarter_map_insurance ON map_insurance(year, quarter)",
-            "CREATE INDEX IF NOT EXISTS idx_state_pincode ON top_transaction(state, pincode)",
-            "CREATE INDEX IF NOT EXISTS idx_year_quarter_top ON top_transaction(year, quarter)",
-            "CREATE INDEX IF NOT EXISTS idx_state_pincode_user ON top_user(state, pincode)",
-            "CREATE INDEX IF NOT EXISTS idx_year_quarter_top_user ON top_user(year, quarter)",
-            "CREATE INDEX IF NOT EXISTS idx_state_pincode_insurance ON top_insurance(state, pincode)",
-            "CREATE INDEX IF NOT EXISTS idx_year_quarter_top_insurance ON top_insurance(year, quarter)"
-        ]
-        
         try:
-            cursor = self.connection.cursor()
+            # Create tables first, as one script and one transaction
+            self.connection.executescript(self._script(create_table_queries))
             
-            # Create tables first
-            for query in create_table_queries:
-                cursor.execute(query)
+        except sqlite3.Error as e:
+            # A failed script stops before its COMMIT
+            if self.connection.in_transaction:
+                self.connection.rollback()
+            print(f"❌ Error creating tables: {e}")
+            raise
+        
+        if not with_indexes:
+            print("✅ All tables created successfully!")
+            return
+        
+        # Create indexes separately (SQLite compatible way)
+        self.create_indexes()
+        print("✅ All tables and indexes created successfully!")
+    
+    def create_indexes(self):
+        """Create indexes used by the analytics queries (safe to re-run)"""
+        try:
+            drop_index_queries = [f"DROP INDEX IF EXISTS {index_name}" for index_name in self.SUPERSEDED_INDEXES]
+            create_index_queries = [
+                f"CREATE INDEX IF NOT EXISTS {index_name} ON {target}" for index_name, target in self.INDEXES.items()
+            ]
+            self.connection.executescript(self._script(drop_index_queries + create_index_queries))
             
-            # Create indexes separately
-            for query in create_index_queries:
-                cursor.execute(query)
-                
+        except sqlite3.Error as e:
+            # A failed script stops before its COMMIT
+            if self.connection.in_transaction:
+                self.connection.rollback()
+            print(f"❌ Error creating indexes: {e}")
+            raise
+
+    def materialized_views_exist(self) -> bool:
+        """Check whether every roll-up table has been built"""
+        placeholders = ', '.join(['?' for _ in self.MATERIALIZED_VIEWS])
+        cursor = self.connection.cursor()
+        cursor.execute(
+            f"SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name IN ({placeholders})",
+            tuple(self.MATERIALIZED_VIEWS)
+        )
+        return cursor.fetchone()[0] == len(self.MATERIALIZED_VIEWS)
+    
+    def schema_is_current(self) -> bool:
+        """Check, without writing, whether every index and roll-up table is in place"""
+        cursor = self.connection.cursor()
+        cursor.execute("SELECT name FROM sqlite_master WHERE type IN ('index', 'table')")
+        names = {row[0] for row in cursor.fetchall()}
+        return (
+            names.issuperset(self.INDEXES)
+            and names.issuperset(self.MATERIALIZED_VIEWS)
+            and names.isdisjoint(self.SUPERSEDED_INDEXES)
+        )
+    
+    def migrate(self):
+        """Bring an existing database up to the current indexes and roll-up tables; writes nothing if already current"""
+        if self.schema_is_current():
+            return
+        
+        self.create_indexes()
+        if not self.materialized_views_exist():
+            self.build_materialized_views()
+    
+    def views_reading(self, table_name: str) -> List[str]:
+        """Names of the roll-up tables built from table_name"""
+        return [view_name for view_name, source in self.MATERIALIZED_VIEW_SOURCES.items() if source == table_name]
+    
+    def _rebuild_materialized_views(self, view_names: Optional[Iterable[str]] = None):
+        """Recreate the given roll-up tables (default: all) inside the caller's transaction, without committing"""
+        cursor = self.connection.cursor()
+        
+        for view_name in (self.MATERIALIZED_VIEWS if view_names is None else view_names):
+            cursor.execute(f"DROP TABLE IF EXISTS {view_name}")
+            cursor.execute(f"CREATE TABLE {view_name} AS {self.MATERIALIZED_VIEWS[view_name]}")
+        
+        # Indexes on roll-ups that were not rebuilt already exist, so these are no-ops for them
+        for query in self.MATERIALIZED_VIEW_INDEXES:
+            cursor.execute(query)
+    
+    def build_materialized_views(self):
+        """Rebuild roll-up tables and commit"""
+        try:
+            self._rebuild_materialized_views()
             self.connection.commit()
-            print("✅ All tables and indexes created successfully!")
+            print("✅ Materialized views rebuilt successfully!")
             
         except sqlite3.Error as e:
-            print(f"❌ Error creating tables: {e}")
+            print(f"❌ Error building materialized views: {e}")
             raise
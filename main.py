@@ -1,68 +1,100 @@
 import os
+import sqlite3
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Add project root to Python path
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
-from database.schema import DatabaseManager
+from database.connection import get_connection
 from database.operations import DatabaseOperations
 from data.data_generator import PhonePeDataGenerator
 from analytics.queries import PhonePeAnalytics
 
+def database_has_data(db_path: str) -> bool:
+    """Check whether sample data was loaded, not just whether the database file exists"""
+    if not os.path.exists(db_path):
+        return False
+    
+    # Read-only, so probing the file never changes it
+    connection = sqlite3.connect(f"{Path(db_path).resolve().as_uri()}?mode=ro", uri=True)
+    try:
+        cursor = connection.execute("SELECT EXISTS (SELECT 1 FROM aggregated_transaction)")
+        return cursor.fetchone()[0] == 1
+    except sqlite3.OperationalError as e:
+        # Tables not created yet; anything else (a locked or corrupt file) must not trigger a fresh setup
+        if "no such table" in str(e):
+            return False
+        raise
+    finally:
+        connection.close()
+
 def setup_database():
     """Setup database with tables and sample data"""
     print("🚀 Setting up PhonePe Transaction Insights Database...")
     
-    # Initialize database
-    db_manager = DatabaseManager()
-    db_ops = DatabaseOperations()
+    # Initialize database on the shared connection, which the analytics step then reuses warm
+    db_ops = DatabaseOperations(connection=get_connection())
     
     try:
         # Connect to database
-        db_manager.connect()
         db_ops.connect()
         
         print("📊 Creating database tables...")
-        db_manager.create_tables()
+        # Indexes are built after the load so inserts do not maintain them row by row
+        db_ops.create_tables(with_indexes=False)
         
         # Generate and insert sample data
         print("🔄 Generating sample data...")
         data_generator = PhonePeDataGenerator()
         
-        # Generate data for all tables
-        tables_data = {
-            'aggregated_transaction': data_generator.generate_aggregated_transaction_data(1500),
-            'aggregated_user': data_generator.generate_aggregated_user_data(1200),
-            'aggregated_insurance': data_generator.generate_aggregated_insurance_data(800),
-            'map_transaction': data_generator.generate_map_transaction_data(1500),
-            'map_user': data_generator.generate_map_user_data(1200),
-            'map_insurance': data_generator.generate_map_insurance_data(1000),
-            'top_transaction': data_generator.generate_top_transaction_data(1200),
-            'top_user': data_generator.generate_top_user_data(1000),
-            'top_insurance': data_generator.generate_top_insurance_data(800)
+        # Generator method and record count per table, one array per column
+        table_specs = {
+            'aggregated_transaction': (PhonePeDataGenerator.generate_aggregated_transaction_columns, 1500),
+            'aggregated_user': (PhonePeDataGenerator.generate_aggregated_user_columns, 1200),
+            'aggregated_insurance': (PhonePeDataGenerator.generate_aggregated_insurance_columns, 800),
+            'map_transaction': (PhonePeDataGenerator.generate_map_transaction_columns, 1500),
+            'map_user': (PhonePeDataGenerator.generate_map_user_columns, 1200),
+            'map_insurance': (PhonePeDataGenerator.generate_map_insurance_columns, 1000),
+            'top_transaction': (PhonePeDataGenerator.generate_top_transaction_columns, 1200),
+            'top_user': (PhonePeDataGenerator.generate_top_user_columns, 1000),
+            'top_insurance': (PhonePeDataGenerator.generate_top_insurance_columns, 800)
         }
         
-        # Insert data into tables
-        for table_name, data in tables_data.items():
-            print(f"📥 Inserting data into {table_name}...")
-            db_ops.insert_bulk_data(table_name, data)
+        # Tables share no state and numpy releases the GIL while drawing, so generate them concurrently
+        generators = data_generator.spawn(len(table_specs))
+        with ThreadPoolExecutor(max_workers=min(len(table_specs), os.cpu_count() or 1)) as executor:
+            futures = {
+                table_name: executor.submit(generate, generator, num_records)
+                for generator, (table_name, (generate, num_records)) in zip(generators, table_specs.items())
+            }
+            tables_data = {table_name: future.result() for table_name, future in futures.items()}
+        
+        # Insert data into tables; per-table progress is reported once in the summary below
+        print("📥 Inserting sample data...")
+        with db_ops.bulk_load():
+            for table_name, data in tables_data.items():
+                db_ops.insert_bulk_columns(table_name, data)
+        
+        print("🗂️  Creating indexes...")
+        db_ops.create_indexes()
         
         print("✅ Database setup completed successfully!")
         
-        # Display summary
-        print("\n📈 Database Summary:")
+        # Display summary in a single write
+        summary = ["\n📈 Database Summary:"]
         for table_name in tables_data.keys():
             info = db_ops.get_table_info(table_name)
-            print(f"  {table_name}: {info.get('row_count', 0)} records")
+            summary.append(f"  {table_name}: {info.get('row_count', 0)} records")
+        print("\n".join(summary))
         
     except Exception as e:
         print(f"❌ Error setting up database: {e}")
         return False
     
     finally:
-        db_manager.close()
         db_ops.close()
     
     return True
@@ -71,7 +103,7 @@ def run_sample_analytics():
     """Run sample analytics queries"""
     print("\n🔍 Running Sample Analytics...")
     
-    analytics = PhonePeAnalytics()
+    analytics = PhonePeAnalytics(connection=get_connection())
     
     try:
         # Transaction overview
@@ -106,12 +138,14 @@ def main():
     print("📱 PhonePe Transaction Insights - Professional Implementation")
     print("=" * 60)
     
-    # Check if database exists
+    # Check if database has been populated; an interrupted setup leaves the file without data
     db_path = "phonepe_insights.db"
-    if not os.path.exists(db_path):
+    if not database_has_data(db_path):
         setup_database()
     else:
-        print("📊 Database already exists. Skipping setup.")
+        print("📊 Database already populated. Skipping setup.")
+        # Databases from older versions may lack the current indexes and roll-up tables
+        DatabaseOperations(db_path, get_connection(db_path)).migrate()
         print("🗑️  Delete 'phonepe_insights.db' to regenerate sample data.")
     
     # Run sample analytics
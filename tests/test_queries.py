@@ -0,0 +1,38 @@
+import os
+import tempfile
+import unittest
+from analytics.queries import PhonePeAnalytics
+from database.operations import DatabaseOperations
+
+class UserEngagementMetricsTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        db_path = os.path.join(self.tmpdir.name, "test.db")
+        
+        db_ops = DatabaseOperations(db_path)
+        db_ops.connect()
+        db_ops.create_tables()
+        db_ops.insert_bulk_data('map_user', [
+            {'state': 'Karnataka', 'year': 2023, 'quarter': 1, 'district': 'Mysuru',
+             'registered_users': 1000, 'app_opens': 5000}
+        ])
+        db_ops.build_materialized_views()
+        db_ops.close()
+        
+        self.analytics = PhonePeAnalytics(db_path)
+    
+    def tearDown(self):
+        self.analytics.close_connection()
+        self.tmpdir.cleanup()
+    
+    def test_state_without_map_user_rows_keeps_aggregated_columns(self):
+        populated = self.analytics.get_user_engagement_metrics('Karnataka')
+        empty = self.analytics.get_user_engagement_metrics('Goa')
+        
+        self.assertTrue(empty.empty)
+        self.assertEqual(list(empty.columns), list(populated.columns))
+        for column in ('total_registered_users', 'avg_opens_per_user', 'district_user_percentage'):
+            self.assertIn(column, empty.columns)
+
+if __name__ == '__main__':
+    unittest.main()
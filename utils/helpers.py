@@ -1,34 +1,115 @@
+import importlib
+import re
+from bisect import bisect_right
+from functools import lru_cache
+from itertools import cycle, islice
 import pandas as pd
 import numpy as np
-from typing import Union, List, Dict, Any
+from typing import Union, List, Dict, Any, Optional, Tuple
+
+# Indian numbering tiers (thousand, lakh, crore) shared by the scalar and vectorized formatters
+INDIAN_THRESHOLDS = (1e3, 1e5, 1e7)
+INDIAN_DIVISORS = (1.0, 1e3, 1e5, 1e7)
+INDIAN_SUFFIXES = ('', ' K', ' L', ' Cr')
+
+# Base colors handed out in order, cycling when more are requested
+COLOR_PALETTE = (
+    '#5F27CD', '#00d2d3', '#ff9ff3', '#54a0ff', '#48dbfb', '#0abde3',
+    '#006ba6', '#0496c7', '#fcbf49', '#f77f00', '#d62828'
+)
+
+# duplicate_check='sample' in validate_data_quality hashes this share of rows, but never fewer than the minimum
+DUPLICATE_SAMPLE_FRACTION = 0.01
+DUPLICATE_SAMPLE_MIN_ROWS = 10000
+
+# Characters removed from column names by clean_column_names
+COLUMN_NAME_PATTERN = re.compile(r'[^a-zA-Z0-9_]')
+
+# Optional accelerators (numba, pyarrow, pyexcelerate) are imported on first use, keeping them off the import path
+@lru_cache(maxsize=None)
+def _optional_module(name: str):
+    """Import an optional dependency once; None when it is not installed"""
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        return None
+
+@lru_cache(maxsize=None)
+def _pct_change_kernel():
+    """numba-compiled loop behind pct_change_array, built on first use; None without numba"""
+    numba = _optional_module('numba')
+    if numba is None:
+        return None
+    
+    @numba.njit(parallel=True, cache=True)
+    def kernel(current: np.ndarray, previous: np.ndarray) -> np.ndarray:
+        out = np.empty_like(current)
+        for i in numba.prange(current.size):
+            out[i] = 0.0 if previous[i] == 0 else (current[i] - previous[i]) / previous[i] * 100.0
+        return out
+    return kernel
+
+def _is_missing(value: Any) -> bool:
+    """pd.isna for a scalar, with plain floats and ints answered without the pandas dispatch"""
+    if isinstance(value, float):
+        return value != value
+    if value is None:
+        return True
+    return not isinstance(value, int) and pd.isna(value)
+
+def _indian_scale(value: Union[int, float]) -> Tuple[float, str]:
+    """Value divided down to its Indian numbering tier, with that tier's suffix"""
+    tier = bisect_right(INDIAN_THRESHOLDS, value)
+    return value / INDIAN_DIVISORS[tier], INDIAN_SUFFIXES[tier]
+
+# Labels are keyed on the exact float; rounding the key first could move a value across a tier boundary
+@lru_cache(maxsize=4096)
+def _format_currency_cached(amount: float) -> str:
+    """Cached body of format_currency"""
+    scaled, suffix = _indian_scale(amount)
+    return f"₹{scaled:.2f}{suffix}"
+
+@lru_cache(maxsize=4096)
+def _format_number_cached(number: float) -> str:
+    """Cached body of format_number"""
+    if number < INDIAN_THRESHOLDS[0]:
+        return f"{int(number):,}"
+    
+    scaled, suffix = _indian_scale(number)
+    return f"{scaled:.2f}{suffix}"
 
 def format_currency(amount: Union[int, float]) -> str:
     """Format number as Indian currency"""
-    if pd.isna(amount):
+    if _is_missing(amount):
         return "₹0.00"
     
-    if amount >= 10000000:  # 1 crore
-        return f"₹{amount/10000000:.2f} Cr"
-    elif amount >= 100000:  # 1 lakh
-        return f"₹{amount/100000:.2f} L"
-    elif amount >= 1000:  # 1 thousand
-        return f"₹{amount/1000:.2f} K"
-    else:
-        return f"₹{amount:.2f}"
+    return _format_currency_cached(float(amount))
 
 def format_number(number: Union[int, float]) -> str:
     """Format large numbers with Indian numbering system"""
-    if pd.isna(number):
+    if _is_missing(number):
         return "0"
     
-    if number >= 10000000:  # 1 crore
-        return f"{number/10000000:.2f} Cr"
-    elif number >= 100000:  # 1 lakh
-        return f"{number/100000:.2f} L"
-    elif number >= 1000:  # 1 thousand
-        return f"{number/1000:.2f} K"
-    else:
-        return f"{int(number):,}"
+    return _format_number_cached(float(number))
+
+def _indian_tiers(values: Union[np.ndarray, pd.Series, List[float]]) -> Tuple[np.ndarray, np.ndarray]:
+    """Scaled values and tier index (0 = none, 1 = K, 2 = L, 3 = Cr) for every element; missing values become 0, infinities stay infinite"""
+    arr = np.nan_to_num(np.asarray(values, dtype=np.float64), nan=0.0, posinf=np.inf, neginf=-np.inf)
+    tiers = np.searchsorted(INDIAN_THRESHOLDS, arr, side='right')
+    return arr / np.asarray(INDIAN_DIVISORS)[tiers], tiers
+
+def format_currency_array(amounts: Union[np.ndarray, pd.Series, List[float]]) -> List[str]:
+    """Format many amounts as Indian currency at once; same output as format_currency per element"""
+    scaled, tiers = _indian_tiers(amounts)
+    return [f"₹{value:.2f}{INDIAN_SUFFIXES[tier]}" for value, tier in zip(scaled.tolist(), tiers.tolist())]
+
+def format_number_array(numbers: Union[np.ndarray, pd.Series, List[float]]) -> List[str]:
+    """Format many numbers with the Indian numbering system at once; same output as format_number per element"""
+    scaled, tiers = _indian_tiers(numbers)
+    return [
+        f"{value:.2f}{INDIAN_SUFFIXES[tier]}" if tier else f"{int(value):,}"
+        for value, tier in zip(scaled.tolist(), tiers.tolist())
+    ]
 
 def calculate_percentage_change(current: float, previous: float) -> float:
     """Calculate percentage change between two values"""
@@ -36,21 +117,111 @@ def calculate_percentage_change(current: float, previous: float) -> float:
         return 0.0
     return ((current - previous) / previous) * 100
 
-def validate_data_quality(df: pd.DataFrame) -> Dict[str, Any]:
-    """Validate data quality and return report"""
+def pct_change_array(current: Union[np.ndarray, pd.Series, List[float]],
+                     previous: Union[np.ndarray, pd.Series, List[float]]) -> np.ndarray:
+    """Element-wise calculate_percentage_change; 0.0 wherever previous is 0"""
+    current, previous = np.broadcast_arrays(np.asarray(current, dtype=np.float64), np.asarray(previous, dtype=np.float64))
+    
+    # numba fuses the arithmetic into one native loop; numpy is used when it is not installed
+    kernel = _pct_change_kernel()
+    if kernel is not None:
+        result = kernel(np.ascontiguousarray(current).ravel(), np.ascontiguousarray(previous).ravel())
+        return result.reshape(current.shape)
+    
+    result = np.zeros(current.shape)
+    np.divide((current - previous) * 100.0, previous, out=result, where=previous != 0)
+    return result
+
+def _estimate_memory_usage(df: pd.DataFrame, sample_rows: int = 1000) -> int:
+    """Approximate deep memory usage; string/object columns are measured on a leading sample and extrapolated"""
+    total = int(df.memory_usage(index=True, deep=False).sum())
+    nrows = len(df)
+    
+    object_positions = [i for i, dtype in enumerate(df.dtypes) if dtype == object or isinstance(dtype, pd.StringDtype)]
+    if object_positions and nrows:
+        sample = df.iloc[:sample_rows, object_positions]
+        # Shallow usage already counted the pointers; add the sampled per-row size of the objects themselves
+        per_row = (sample.memory_usage(index=False, deep=True).sum() -
+                   sample.memory_usage(index=False, deep=False).sum()) / len(sample)
+        total += int(per_row * nrows)
+    
+    return total
+
+def _shrink_series(series: pd.Series, category_threshold: float) -> pd.Series:
+    """Smallest lossless representation of one column"""
+    if pd.api.types.is_bool_dtype(series.dtype):
+        return series
+    if pd.api.types.is_integer_dtype(series.dtype):
+        return pd.to_numeric(series, downcast='integer')
+    if series.dtype == np.float64:
+        # Amounts must survive the round trip, so only downcast when float32 is exact
+        values = series.to_numpy()
+        narrowed = values.astype(np.float32)
+        if np.array_equal(narrowed.astype(np.float64), values, equal_nan=True):
+            return pd.Series(narrowed, index=series.index, name=series.name)
+        return series
+    if series.dtype == object or isinstance(series.dtype, pd.StringDtype):
+        if len(series) and series.nunique() / len(series) < category_threshold:
+            return series.astype('category')
+    return series
+
+def shrink_dataframe(df: pd.DataFrame, category_threshold: float = 0.5) -> pd.DataFrame:
+    """Downcast numeric columns and turn low-cardinality text columns into categoricals"""
+    if len(df.columns) == 0:
+        return df
+    return pd.concat([_shrink_series(series, category_threshold) for _, series in df.items()], axis=1)
+
+def _count_duplicates(df: pd.DataFrame, duplicate_check: str) -> Optional[int]:
+    """Duplicate row count: exact ('full'), extrapolated from a row sample ('sample') or skipped ('none')"""
+    if duplicate_check == 'none':
+        return None
+    
+    sample_size = max(int(len(df) * DUPLICATE_SAMPLE_FRACTION), DUPLICATE_SAMPLE_MIN_ROWS)
+    if duplicate_check == 'full' or sample_size >= len(df):
+        return int(df.duplicated().sum())
+    
+    # Only duplicates that land together in the sample are seen, so scattered ones are undercounted
+    sample = df.sample(n=sample_size, random_state=0)
+    return int(round(sample.duplicated().sum() / sample_size * len(df)))
+
+def to_arrow_backed(df: pd.DataFrame, categorical_cols: Optional[List[str]] = None) -> pd.DataFrame:
+    """Convert columns to Arrow-backed dtypes (nullable numpy dtypes without pyarrow), with optional categoricals"""
+    # Arrow-backed columns (strings especially) take far less memory than numpy object columns
+    backend = 'pyarrow' if _optional_module('pyarrow') is not None else 'numpy_nullable'
+    # Whole-number floats stay floats, so a float32 column is not widened to int64
+    converted = df.convert_dtypes(convert_integer=False, dtype_backend=backend)
+    if categorical_cols:
+        converted = converted.astype({column: 'category' for column in categorical_cols})
+    return converted
+
+def validate_data_quality(df: pd.DataFrame, deep_memory: bool = False, optimize: bool = False,
+                          duplicate_check: str = 'full') -> Dict[str, Any]:
+    """Validate data quality and return report; deep_memory and duplicate_check='full' are exact but scan every row"""
+    if optimize:
+        # Report dtypes and memory for the frame callers would get from shrink_dataframe and to_arrow_backed
+        df = shrink_dataframe(df)
+        if _optional_module('pyarrow') is not None:
+            df = to_arrow_backed(df)
+    
+    nrows, ncols = len(df), len(df.columns)
+    # One null-mask scan feeds both the per-column counts and the overall percentage
+    na_counts = df.isnull().sum()
+    
     report = {
-        'total_rows': len(df),
-        'total_columns': len(df.columns),
-        'missing_values': df.isnull().sum().to_dict(),
-        'duplicate_rows': df.duplicated().sum(),
-        'data_types': df.dtypes.to_dict(),
-        'memory_usage': df.memory_usage(deep=True).sum(),
+        'total_rows': nrows,
+        'total_columns': ncols,
+        'missing_values': na_counts.to_dict(),
+        'duplicate_rows': _count_duplicates(df, duplicate_check),
+        # dtype names rather than dtype objects keep the report small for wide frames
+        'data_types': dict(zip(df.columns.tolist(), df.dtypes.astype(str).tolist())),
+        'memory_usage': df.memory_usage(deep=True).sum() if deep_memory else _estimate_memory_usage(df),
         'quality_score': 0.0
     }
     
-    # Calculate quality score
-    missing_percentage = (df.isnull().sum().sum() / (len(df) * len(df.columns))) * 100
-    duplicate_percentage = (report['duplicate_rows'] / len(df)) * 100
+    # Calculate quality score; an empty frame has nothing missing or duplicated
+    cells = nrows * ncols
+    missing_percentage = (na_counts.sum() / cells) * 100 if cells else 0.0
+    duplicate_percentage = (report['duplicate_rows'] / nrows) * 100 if nrows and report['duplicate_rows'] is not None else 0.0
     
     quality_score = max(0, 100 - missing_percentage - duplicate_percentage)
     report['quality_score'] = round(quality_score, 2)
@@ -59,22 +230,34 @@ def validate_data_quality(df: pd.DataFrame) -> Dict[str, Any]:
 
 def get_color_palette(n_colors: int) -> List[str]:
     """Get a color palette with specified number of colors"""
-    colors = [
-        '#5F27CD', '#00d2d3', '#ff9ff3', '#54a0ff', '#5f27cd',
-        '#00d2d3', '#ff9ff3', '#54a0ff', '#48dbfb', '#0abde3',
-        '#006ba6', '#0496c7', '#fcbf49', '#f77f00', '#d62828'
-    ]
-    
-    if n_colors <= len(colors):
-        return colors[:n_colors]
-    else:
-        # Repeat colors if more needed
-        return (colors * ((n_colors // len(colors)) + 1))[:n_colors]
+    # Repeat colors if more needed, allocating exactly n_colors entries
+    return list(islice(cycle(COLOR_PALETTE), max(n_colors, 0)))
+
+def _export_with_pyexcelerate(pyexcelerate, data_dict: Dict[str, pd.DataFrame], filename: str):
+    """Write each DataFrame as a header row plus its values with pyexcelerate"""
+    workbook = pyexcelerate.Workbook()
+    for sheet_name, df in data_dict.items():
+        # Missing values become empty cells, as with the pandas writers
+        values = df.astype(object).where(df.notna(), None)
+        worksheet = workbook.new_sheet(sheet_name, data=[df.columns.tolist()] + values.to_numpy().tolist())
+        
+        # pyexcelerate stores datetimes as serial numbers; give them the format pandas would
+        for position, dtype in enumerate(df.dtypes, 1):
+            if pd.api.types.is_datetime64_any_dtype(dtype):
+                worksheet.set_col_style(position, pyexcelerate.Style(format=pyexcelerate.Format('yyyy-mm-dd hh:mm:ss')))
+    workbook.save(filename)
 
 def export_to_excel(data_dict: Dict[str, pd.DataFrame], filename: str) -> bool:
     """Export multiple DataFrames to Excel with different sheets"""
     try:
-        with pd.ExcelWriter(filename, engine='openpyxl') as writer:
+        # pyexcelerate writes whole sheets from row lists, skipping pandas' per-cell loop; use it when installed
+        pyexcelerate = _optional_module('pyexcelerate')
+        if pyexcelerate is not None:
+            _export_with_pyexcelerate(pyexcelerate, data_dict, filename)
+            return True
+        
+        # Without pyexcelerate: xlsxwriter is a write-only engine and several times faster than openpyxl
+        with pd.ExcelWriter(filename, engine='xlsxwriter') as writer:
             for sheet_name, df in data_dict.items():
                 df.to_excel(writer, sheet_name=sheet_name, index=False)
         return True
@@ -84,26 +267,25 @@ def export_to_excel(data_dict: Dict[str, pd.DataFrame], filename: str) -> bool:
 
 def create_summary_stats(df: pd.DataFrame, numeric_columns: List[str]) -> pd.DataFrame:
     """Create summary statistics for numeric columns"""
-    summary = df[numeric_columns].describe()
+    subset = df[numeric_columns]
     
-    # Add additional statistics
-    summary.loc['missing'] = df[numeric_columns].isnull().sum()
-    summary.loc['missing_pct'] = (df[numeric_columns].isnull().sum() / len(df)) * 100
-    summary.loc['unique'] = df[numeric_columns].nunique()
+    # Add additional statistics, built in one frame and appended once
+    missing = subset.isnull().sum()
+    extra = pd.DataFrame({
+        'missing': missing,
+        'missing_pct': (missing / len(df)) * 100,
+        'unique': subset.nunique()
+    }).T
     
-    return summary
+    return pd.concat([subset.describe(), extra])
 
 def clean_column_names(df: pd.DataFrame) -> pd.DataFrame:
     """Clean and standardize column names"""
-    df_clean = df.copy()
-    
-    # Convert to lowercase and replace spaces with underscores
-    df_clean.columns = df_clean.columns.str.lower().str.replace(' ', '_')
+    # Convert to lowercase, replace spaces with underscores and remove special characters
+    columns = [COLUMN_NAME_PATTERN.sub('', column.lower().replace(' ', '_')) for column in df.columns]
     
-    # Remove special characters
-    df_clean.columns = df_clean.columns.str.replace(r'[^a-zA-Z0-9_]', '', regex=True)
-    
-    return df_clean
+    # set_axis assigns labels by position, so duplicate source names still map correctly
+    return df.set_axis(columns, axis=1)
 
 def get_top_insights(df: pd.DataFrame, metric_column: str, group_column: str, top_n: int = 5) -> List[str]:
     """Generate top insights from data"""
@@ -111,21 +293,80 @@ def get_top_insights(df: pd.DataFrame, metric_column: str, group_column: str, to
     
     try:
         # Top performers
-        top_data = df.groupby(group_column)[metric_column].sum().sort_values(ascending=False).head(top_n)
+        # Group just the metric column by the key column; the rest of the frame is never touched
+        metric = df[metric_column]
+        sums = metric.groupby(df[group_column], sort=False, observed=True, dropna=False).sum()
+        
+        # The group sums already add up to the overall total (missing keys are kept for that)
+        total = sums.sum()
+        count = metric.count()
+        average = total / count if count else 0.0
+        sums = sums[sums.index.notna()]
+        
+        # Select the top_n groups in linear time and sort only those
+        if 0 < top_n < len(sums):
+            sums = sums.iloc[np.argpartition(-sums.to_numpy(), top_n - 1)[:top_n]]
+        top_data = sums.sort_values(ascending=False).head(top_n)
+        
+        # Label every value in one vectorized pass
+        format_values = format_currency_array if 'amount' in metric_column.lower() else format_number_array
         
         insights.append(f"Top {group_column} by {metric_column}:")
-        for idx, (name, value) in enumerate(top_data.items(), 1):
-            insights.append(f"{idx}. {name}: {format_currency(value) if 'amount' in metric_column.lower() else format_number(value)}")
+        insights.extend(
+            f"{idx}. {name}: {label}"
+            for idx, (name, label) in enumerate(zip(top_data.index, format_values(top_data.to_numpy())), 1)
+        )
         
         # Overall statistics
-        total = df[metric_column].sum()
-        average = df[metric_column].mean()
-        
-        insights.append(f"\nOverall Statistics:")
-        insights.append(f"Total {metric_column}: {format_currency(total) if 'amount' in metric_column.lower() else format_number(total)}")
-        insights.append(f"Average {metric_column}: {format_currency(average) if 'amount' in metric_column.lower() else format_number(average)}")
+        total_label, average_label = format_values([total, average])
+        insights.extend([
+            "\nOverall Statistics:",
+            f"Total {metric_column}: {total_label}",
+            f"Average {metric_column}: {average_label}"
+        ])
         
     except Exception as e:
         insights.append(f"Error generating insights: {e}")
     
     return insights
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Indices kept by Largest-Triangle-Three-Buckets downsampling of a sorted series"""
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    
+    # First and last points are always kept; the rest is split into n_out - 2 buckets
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    indices = np.empty(n_out, dtype=int)
+    indices[0], indices[-1] = 0, n - 1
+    
+    previous = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        
+        # Keep the point forming the largest triangle with the previous pick and the next bucket's mean
+        area = np.abs(
+            (x[previous] - avg_x) * (y[start:end] - y[previous]) -
+            (x[previous] - x[start:end]) * (avg_y - y[previous])
+        )
+        previous = start + int(np.argmax(area))
+        indices[i + 1] = previous
+    
+    return indices
+
+def downsample_lttb(df: pd.DataFrame, x: str, y: str, n_out: int = 500, group: Optional[str] = None) -> pd.DataFrame:
+    """Thin a line series to at most n_out points per group while keeping its visual shape"""
+    if len(df) <= n_out:
+        return df
+    
+    if group is not None:
+        parts = [downsample_lttb(part, x, y, n_out) for _, part in df.groupby(group, observed=True, sort=False)]
+        return pd.concat(parts)
+    
+    ordered = df.sort_values(x)
+    keep = lttb_indices(ordered[x].to_numpy(dtype=np.float64), ordered[y].to_numpy(dtype=np.float64), n_out)
+    return ordered.iloc[keep]